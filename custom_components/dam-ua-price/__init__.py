@@ -1,16 +1,23 @@
 
 from __future__ import annotations
+from functools import partial
+from time import monotonic
 from typing import Any
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LOGGER, PLATFORMS
+from .config_flow import entry_title
+from .const import DEFAULT_NAME, DOMAIN, LOGGER, PLATFORMS
 from .coordinator import DAMDataUpdateCoordinator
-# from .services import async_setup_services
+from .services import async_setup_services
+from .source import DAMPriceSource
 
 type DAMConfigEntry = ConfigEntry[DAMDataUpdateCoordinator]
 
@@ -20,7 +27,34 @@ CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the service."""
 
-    #async_setup_services(hass)
+    async_setup_services(hass)
+    return True
+
+
+async def async_migrate_entry(
+    hass: HomeAssistant, config_entry: DAMConfigEntry
+) -> bool:
+    """Migrate old entry."""
+    if config_entry.version > 1:
+        return False
+
+    if config_entry.minor_version < 2:
+        # entries all had the same title, which also names the device now
+        hass.config_entries.async_update_entry(
+            config_entry,
+            title=(
+                entry_title(config_entry.data)
+                if config_entry.title == DEFAULT_NAME
+                else config_entry.title
+            ),
+            minor_version=2,
+        )
+
+    LOGGER.debug(
+        "Migrated to version %s.%s",
+        config_entry.version,
+        config_entry.minor_version,
+    )
     return True
 
 
@@ -28,21 +62,29 @@ async def async_setup_entry(
     hass: HomeAssistant, config_entry: DAMConfigEntry
 ) -> bool:
     """Set up from a config entry."""
+    started = monotonic()
 
     await cleanup_device(hass, config_entry)
-
-    coordinator = DAMDataUpdateCoordinator(hass, config_entry)
-    await coordinator.init()
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady(
-            translation_domain=DOMAIN,
-            translation_key="initial_update_failed",
-            translation_placeholders={"error": str(coordinator.last_exception)},
-        )
+    await er.async_migrate_entries(
+        hass, config_entry.entry_id, partial(migrate_unique_id, config_entry)
+    )
+
+    # all entries share the prices, each one adds its own meter and tariff
+    source = DAMPriceSource.async_get(hass)
+    coordinator = DAMDataUpdateCoordinator(hass, config_entry, source)
+    # only the local cache is read here, OREE is asked in the background
+    await source.async_load_cache(dt_util.utcnow())
     config_entry.runtime_data = coordinator
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+    config_entry.async_create_background_task(
+        hass, coordinator.init(), f"{DOMAIN} initial update"
+    )
+
+    coordinator.setup_duration = monotonic() - started
+    LOGGER.debug("Set up in %.1f ms", coordinator.setup_duration * 1000)
+
     return True
 
 
@@ -61,10 +103,26 @@ async def cleanup_device(
 
     entries = dr.async_entries_for_config_entry(device_reg, config_entry.entry_id)
     for entry in entries:
-        if entry.identifiers == {(DOMAIN)}:
+        if entry.identifiers == {(DOMAIN, config_entry.entry_id)}:
             continue
 
         LOGGER.debug("Removing device %s", entry.name)
         device_reg.async_update_device(
             entry.id, remove_config_entry_id=config_entry.entry_id
         )
+
+
+@callback
+def migrate_unique_id(
+    config_entry: DAMConfigEntry, entity_entry: er.RegistryEntry
+) -> dict[str, Any] | None:
+    """Move unique ids shared by the whole domain to ones of the entry."""
+    # ids used to start with a literal $ before the domain
+    for prefix in (f"${DOMAIN}-", f"{DOMAIN}-"):
+        if entity_entry.unique_id.startswith(prefix):
+            return {
+                "new_unique_id": entity_entry.unique_id.replace(
+                    prefix, f"{config_entry.entry_id}-", 1
+                )
+            }
+    return None
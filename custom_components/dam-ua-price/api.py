@@ -0,0 +1,172 @@
+"""OREE API client."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date
+from random import random
+from time import monotonic
+from typing import Any
+
+import aiohttp
+
+from .const import LOGGER, kiev_tz
+from .parsing import InvalidPrices, json_loads, parse_prices
+from .stats import LatencyHistogram
+from .timeline import PriceTimeline
+
+DEFAULT_BASE_URL = "https://www.oree.com.ua/index.php"
+
+REQUEST_TIMEOUT = 15
+MAX_RETRIES = 3
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 30.0
+
+REQUEST_HEADERS = {
+    "accept": "application/json, text/javascript, */*; q=0.01",
+    "x-requested-with": "XMLHttpRequest",
+}
+
+
+class OREEError(Exception):
+    """Base error of the OREE client."""
+
+
+class OREEConnectionError(OREEError):
+    """OREE could not be reached or kept failing after all retries."""
+
+
+class OREEResponseError(OREEError):
+    """OREE answered with prices that cannot be used."""
+
+
+@dataclass
+class OREEClientStats:
+    """Request accounting of the OREE client."""
+
+    requests: int = 0
+    failures: int = 0
+    retries: int = 0
+    total_latency: float = 0.0
+    last_latency: float | None = None
+    rejected: int = 0
+    last_rejection: str | None = None
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def average_latency(self) -> float | None:
+        """Return the average latency of successful requests in seconds."""
+        succeeded = self.requests - self.failures
+        if succeeded <= 0:
+            return None
+        return self.total_latency / succeeded
+
+
+class OREEClient:
+    """Client for the OREE price endpoints.
+
+    Uses a shared keep-alive session, so connections are reused between
+    requests instead of paying DNS, TCP and TLS setup on every call.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = REQUEST_TIMEOUT,
+        retries: int = MAX_RETRIES,
+    ) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._base_url = base_url.rstrip("/")
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._retries = retries
+        self.stats = OREEClientStats()
+
+    def prices_url(self, day: date, market: str = "DAM", zone: int = 2) -> str:
+        """Return the URL of the prices of a delivery day."""
+        return (
+            f"{self._base_url}/PXS/get_pxs_hdata/"
+            f"{day.strftime('%d.%m.%Y')}/{market}/{zone}"
+        )
+
+    async def async_get_payload(
+        self,
+        day: date,
+        market: str = "DAM",
+        zone: int = 2,
+        retries: int | None = None,
+    ) -> Any:
+        """Return the decoded response for a delivery day."""
+        return await self._async_request(
+            self.prices_url(day, market, zone),
+            self._retries if retries is None else retries,
+        )
+
+    async def async_get_prices(
+        self,
+        day: date,
+        market: str = "DAM",
+        zone: int = 2,
+        retries: int | None = None,
+    ) -> PriceTimeline | None:
+        """Return the prices of a delivery day, None if not published yet."""
+        data = await self.async_get_payload(day, market, zone, retries)
+        try:
+            return parse_prices(data, day, kiev_tz)
+        except InvalidPrices as error:
+            self.stats.rejected += 1
+            self.stats.last_rejection = str(error)
+            raise OREEResponseError(
+                f"Rejected {market} zone {zone} prices of {day}: {error}"
+            ) from error
+
+    async def _async_request(self, url: str, retries: int) -> Any:
+        """Post to OREE, retrying with exponential backoff on transient errors."""
+        delay = BACKOFF_INITIAL
+        attempt = 0
+
+        while True:
+            self.stats.requests += 1
+            started = monotonic()
+            try:
+                async with self._session.post(
+                    url, headers=REQUEST_HEADERS, timeout=self._timeout
+                ) as response:
+                    response.raise_for_status()
+                    # orjson parses the bytes, no str copy of the body
+                    data = json_loads(await response.read())
+            except aiohttp.ClientResponseError as error:
+                self.stats.failures += 1
+                # client errors will not fix themselves by asking again
+                if error.status < 500 and error.status != 429:
+                    raise OREEError(f"OREE request failed: {error}") from error
+                last_error: Exception = error
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as error:
+                self.stats.failures += 1
+                last_error = error
+            else:
+                latency = monotonic() - started
+                self.stats.last_latency = latency
+                self.stats.total_latency += latency
+                self.stats.latency.record(latency)
+                LOGGER.debug("OREE %s answered in %.3fs", url, latency)
+                return data
+
+            if attempt >= retries:
+                raise OREEConnectionError(
+                    f"OREE request failed after {attempt + 1} attempts: {last_error}"
+                ) from last_error
+
+            attempt += 1
+            self.stats.retries += 1
+            LOGGER.debug(
+                "OREE request failed (%s), retry %s in %.1fs",
+                last_error,
+                attempt,
+                delay,
+            )
+            # jitter keeps retries of many installations apart
+            await asyncio.sleep(delay * (0.5 + random() / 2))
+            delay = min(delay * 2, BACKOFF_MAX)
@@ -0,0 +1,183 @@
+"""Charge and discharge planning of a home battery against prices."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from enum import StrEnum
+from math import ceil, floor, inf, sqrt
+from typing import Any
+
+from .timeline import PriceTimeline
+
+# state of charge is planned on a grid of at least this many steps, finer
+# when a slot at full power moves less than one step, up to the maximum
+SOC_LEVELS = 100
+MAX_SOC_LEVELS = 1000
+# float noise must not turn an exact number of steps into one less
+STEP_TOLERANCE = 1e-9
+
+
+class BatteryAction(StrEnum):
+    """What the battery does during a slot."""
+
+    CHARGE = "charge"
+    IDLE = "idle"
+    DISCHARGE = "discharge"
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryConfig:
+    """Battery limits, energies in kWh and powers in kW."""
+
+    capacity: float
+    charge_power: float
+    discharge_power: float
+    efficiency: float = 0.9
+
+    def level(self, soc: float, levels: int = SOC_LEVELS) -> int:
+        """Return the level of a state of charge on a grid of levels steps."""
+        return max(0, min(levels, round(soc / self.capacity * levels)))
+
+    def slot_energy(self, hours: float) -> tuple[float, float]:
+        """Return the stored energy a slot can add and take at full power."""
+        return (
+            self.charge_power * hours * sqrt(self.efficiency),
+            self.discharge_power * hours,
+        )
+
+    def levels(self, slot_hours: float) -> int:
+        """Return the grid size on which a slot moves at least one step."""
+        if not (moves := [energy for energy in self.slot_energy(slot_hours) if energy]):
+            return SOC_LEVELS
+        return max(SOC_LEVELS, min(MAX_SOC_LEVELS, ceil(self.capacity / min(moves))))
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryPlan:
+    """Action and resulting state of charge per slot, and the expected profit."""
+
+    actions: tuple[BatteryAction, ...]
+    soc: tuple[float, ...]
+    profit: float
+
+    def as_dict(self, timeline: PriceTimeline, tz: tzinfo) -> dict[str, Any]:
+        """Return the plan for the slots of a timeline with ISO formatted times."""
+        return {
+            "profit": self.profit,
+            "plan": [
+                {
+                    "start": datetime.fromtimestamp(start, tz).isoformat(),
+                    "end": datetime.fromtimestamp(end, tz).isoformat(),
+                    "action": action.value,
+                    "soc": soc,
+                }
+                for start, end, action, soc in zip(
+                    timeline.starts, timeline.ends, self.actions, self.soc
+                )
+            ],
+        }
+
+
+class BatteryPlanner:
+    """Dynamic programming planner over a discretized state of charge.
+
+    The table is built forwards from the starting state of charge, so when
+    prices of new slots arrive the existing layers are kept and only the new
+    slots are added. Each slot costs three steps per grid level, a 48 slot
+    horizon on the default grid plans in a few milliseconds.
+
+    The grid is made fine enough for the shortest slot at full power to
+    move at least one step. In every slot the battery idles, charges or
+    discharges at full power rounded down to whole steps, so the power
+    limits always hold, and never beyond empty or full. The plan is
+    optimal among those actions, not among partial charging or
+    discharging. A battery too large for its power to move one step of
+    the finest grid is never planned to run.
+    """
+
+    def __init__(
+        self, config: BatteryConfig, soc: float, slot_hours: float = 1.0
+    ) -> None:
+        """Initialize the planner for slots of at least slot_hours."""
+        self.config = config
+        self.levels = config.levels(slot_hours)
+        self.start_level = config.level(soc, self.levels)
+        self._step = config.capacity / self.levels
+        # losses are split evenly between charging and discharging
+        self._charge_efficiency = self._discharge_efficiency = sqrt(config.efficiency)
+        self._values = [-inf] * (self.levels + 1)
+        self._values[self.start_level] = 0.0
+        self._previous: list[array] = []
+
+    def __len__(self) -> int:
+        return len(self._previous)
+
+    def extend(
+        self,
+        durations: Sequence[float],
+        buy_prices: Sequence[float],
+        sell_prices: Sequence[float],
+    ) -> None:
+        """Add slots to the horizon, durations in hours and prices per kWh."""
+        step = self._step
+        charge_in = step / self._charge_efficiency
+        discharge_out = step * self._discharge_efficiency
+
+        top = self.levels
+        for hours, buy, sell in zip(durations, buy_prices, sell_prices, strict=True):
+            charged, discharged = self.config.slot_energy(hours)
+            charge_levels = floor(charged / step + STEP_TOLERANCE)
+            discharge_levels = floor(discharged / step + STEP_TOLERANCE)
+            values = self._values
+            new_values = [-inf] * (top + 1)
+            previous = array("H", range(top + 1))
+
+            for level, value in enumerate(values):
+                if value == -inf:
+                    continue
+
+                if value > new_values[level]:
+                    new_values[level] = value
+                    previous[level] = level
+
+                target = min(top, level + charge_levels)
+                candidate = value - (target - level) * charge_in * buy
+                if target != level and candidate > new_values[target]:
+                    new_values[target] = candidate
+                    previous[target] = level
+
+                target = max(0, level - discharge_levels)
+                candidate = value + (level - target) * discharge_out * sell
+                if target != level and candidate > new_values[target]:
+                    new_values[target] = candidate
+                    previous[target] = level
+
+            self._values = new_values
+            self._previous.append(previous)
+
+    def plan(self) -> BatteryPlan:
+        """Return the most profitable plan over the horizon."""
+        level = max(range(self.levels + 1), key=self._values.__getitem__)
+        profit = self._values[level]
+        levels = [level]
+        for previous in reversed(self._previous):
+            level = previous[level]
+            levels.append(level)
+        levels.reverse()
+
+        actions = tuple(
+            BatteryAction.CHARGE
+            if after > before
+            else BatteryAction.DISCHARGE
+            if after < before
+            else BatteryAction.IDLE
+            for before, after in zip(levels, levels[1:])
+        )
+        return BatteryPlan(
+            actions,
+            tuple(level * self._step for level in levels[1:]),
+            profit,
+        )
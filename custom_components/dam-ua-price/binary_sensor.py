@@ -0,0 +1,72 @@
+"""Binary sensor platform for integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+
+from . import DAMConfigEntry
+from .entity import DAMBaseEntity, DAMEntityDescription
+from .levels import PriceLevel
+
+PARALLEL_UPDATES = 0
+
+
+@dataclass(frozen=True, kw_only=True)
+class DAMBinarySensorEntityDescription(
+    BinarySensorEntityDescription, DAMEntityDescription
+):
+    """Describes binary sensor entity."""
+
+    is_on_fn: Callable[[DAMBinarySensor], bool | None]
+
+
+BINARY_SENSOR_TYPES: tuple[DAMBinarySensorEntityDescription, ...] = (
+    DAMBinarySensorEntityDescription(
+        key="cheap_price",
+        translation_key="cheap_price",
+        depends_on=frozenset({"level"}),
+        is_on_fn=lambda entity: (
+            entity.coordinator.get_price_level().level is PriceLevel.CHEAP
+        ),
+    ),
+    DAMBinarySensorEntityDescription(
+        key="expensive_price",
+        translation_key="expensive_price",
+        depends_on=frozenset({"level"}),
+        is_on_fn=lambda entity: (
+            entity.coordinator.get_price_level().level is PriceLevel.EXPENSIVE
+        ),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: DAMConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up binary sensor platform."""
+    coordinator = entry.runtime_data
+    async_add_entities(
+        DAMBinarySensor(coordinator, description)
+        for description in BINARY_SENSOR_TYPES
+    )
+
+
+class DAMBinarySensor(DAMBaseEntity, BinarySensorEntity):
+    """Representation of a binary sensor."""
+
+    entity_description: DAMBinarySensorEntityDescription
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the binary sensor is on."""
+        return self.entity_description.is_on_fn(self)
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_CURRENCY
+from homeassistant.const import CONF_CURRENCY, CONF_NAME
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
@@ -18,18 +19,51 @@ from homeassistant.helpers.selector import (
     NumberSelector,
     SelectSelectorConfig,
     SelectSelectorMode,
+    EntitySelector,
+    EntitySelectorConfig,
+    ObjectSelector,
+    TextSelector,
 )
 from homeassistant.util import dt as dt_util
 
-from .const import METER_ZONES, DEFAULT_NAME, DOMAIN, CONF_BASE_PRICE
+from .const import (
+    METER_ZONES,
+    DEFAULT_NAME,
+    DOMAIN,
+    CONF_BASE_PRICE,
+    CONF_BATTERY_CAPACITY,
+    CONF_BATTERY_EFFICIENCY,
+    CONF_BATTERY_POWER,
+    CONF_BATTERY_SOC_ENTITY,
+    CONF_CHEAP_SHARE,
+    CONF_CHEAPEST_HOURS,
+    CONF_EXPENSIVE_SHARE,
+    CONF_RETENTION_DAYS,
+    CONF_SERIES,
+    CONF_TARIFF,
+    DEFAULT_BATTERY_EFFICIENCY,
+    DEFAULT_CHEAP_SHARE,
+    DEFAULT_CHEAPEST_HOURS,
+    DEFAULT_EXPENSIVE_SHARE,
+    DEFAULT_RETENTION_DAYS,
+    DEFAULT_SERIES,
+    SERIES,
+)
+from .tariff import TariffSchedule
 
 # SELECT_AREAS = [
 #     SelectOptionDict(value=area, label=name) for area, name in AREAS.items()
 # ]
 SELECT_CURRENCY = ["1", "2", "3"]
+SELECT_SERIES = [
+    SelectOptionDict(value=key, label=label)
+    for key, label in SERIES.items()
+    if key != DEFAULT_SERIES
+]
 
 DATA_SCHEMA = vol.Schema(
     {
+        vol.Optional(CONF_NAME): TextSelector(),
         vol.Required(METER_ZONES, default="2"): SelectSelector(
             SelectSelectorConfig(
                 options=SELECT_CURRENCY,
@@ -47,20 +81,117 @@ DATA_SCHEMA = vol.Schema(
                 mode="box",
             )
         ),
+        vol.Optional(
+            CONF_RETENTION_DAYS, default=DEFAULT_RETENTION_DAYS
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=31,
+                step=1,
+                unit_of_measurement="days",
+                mode="box",
+            )
+        ),
+        vol.Optional(CONF_SERIES, default=[]): SelectSelector(
+            SelectSelectorConfig(
+                options=SELECT_SERIES,
+                multiple=True,
+                mode=SelectSelectorMode.LIST,
+            )
+        ),
+        vol.Optional(
+            CONF_CHEAPEST_HOURS, default=DEFAULT_CHEAPEST_HOURS
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=0.25,
+                max=24,
+                step=0.25,
+                unit_of_measurement="h",
+                mode="box",
+            )
+        ),
+        vol.Optional(CONF_CHEAP_SHARE, default=DEFAULT_CHEAP_SHARE): NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=50,
+                step=1,
+                unit_of_measurement="%",
+                mode="box",
+            )
+        ),
+        vol.Optional(
+            CONF_EXPENSIVE_SHARE, default=DEFAULT_EXPENSIVE_SHARE
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=50,
+                step=1,
+                unit_of_measurement="%",
+                mode="box",
+            )
+        ),
+        vol.Optional(CONF_BATTERY_CAPACITY, default=0): NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=1000,
+                step=0.1,
+                unit_of_measurement="kWh",
+                mode="box",
+            )
+        ),
+        vol.Optional(CONF_BATTERY_POWER, default=0): NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=1000,
+                step=0.1,
+                unit_of_measurement="kW",
+                mode="box",
+            )
+        ),
+        vol.Optional(
+            CONF_BATTERY_EFFICIENCY, default=DEFAULT_BATTERY_EFFICIENCY
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=100,
+                step=1,
+                unit_of_measurement="%",
+                mode="box",
+            )
+        ),
+        vol.Optional(CONF_BATTERY_SOC_ENTITY): EntitySelector(
+            EntitySelectorConfig(domain=["sensor", "input_number", "number"])
+        ),
+        vol.Optional(CONF_TARIFF): ObjectSelector(),
     }
 )
 
 
-async def test_api(hass: HomeAssistant, user_input: dict[str, Any]) -> dict[str, str]:
+def entry_title(data: Mapping[str, Any]) -> str:
+    """Return the title of an entry, telling several meters apart."""
+    if name := data.get(CONF_NAME):
+        return name
+    if data.get(CONF_TARIFF):
+        return f"{DEFAULT_NAME}, custom tariff"
+    return f"{DEFAULT_NAME}, {data.get(METER_ZONES) or '2'} zone meter"
 
 
-    return {}
+async def test_api(hass: HomeAssistant, user_input: dict[str, Any]) -> dict[str, str]:
+    errors: dict[str, str] = {}
+    if tariff := user_input.get(CONF_TARIFF):
+        try:
+            TariffSchedule.from_config(tariff)
+        except ValueError:
+            errors[CONF_TARIFF] = "invalid_tariff"
+
+    return errors
 
 
 class DAMConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for integration."""
 
     VERSION = 1
+    MINOR_VERSION = 2
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -71,7 +202,7 @@ class DAMConfigFlow(ConfigFlow, domain=DOMAIN):
             errors = await test_api(self.hass, user_input)
             if not errors:
                 return self.async_create_entry(
-                    title=DEFAULT_NAME,
+                    title=entry_title(user_input),
                     data=user_input,
                 )
 
@@ -90,8 +221,12 @@ class DAMConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input:
             errors = await test_api(self.hass, user_input)
             if not errors:
+                # the form holds every key, optional ones left empty are
+                # missing from it and must not keep their old values
                 return self.async_update_reload_and_abort(
-                    reconfigure_entry, data_updates=user_input
+                    reconfigure_entry,
+                    title=entry_title(user_input),
+                    data=user_input,
                 )
 
         return self.async_show_form(
@@ -1,5 +1,6 @@
 from homeassistant.const import Platform
 import logging
+from zoneinfo import ZoneInfo
 
 LOGGER = logging.getLogger(__package__)
 
@@ -8,7 +9,41 @@ DEFAULT_NAME = "UA Day Ahead Market Price (РДН)"
 
 METER_ZONES = "meter_zones"
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+kiev_tz = ZoneInfo("Europe/Kiev")
 
 CONF_BASE_PRICE = "price"
 
+CONF_RETENTION_DAYS = "retention_days"
+# days before today kept in memory, older ones are only on disk
+DEFAULT_RETENTION_DAYS = 1
+
+CONF_SERIES = "series"
+# the series behind the main price sensors
+DEFAULT_SERIES = "DAM_2"
+# market and price zone pairs, extra series get their own sensors
+SERIES = {
+    "DAM_2": "DAM",
+    "DAM_1": "DAM zone 1",
+    "IDM_2": "IDM",
+    "IDM_1": "IDM zone 1",
+}
+
+CONF_CHEAPEST_HOURS = "cheapest_hours"
+DEFAULT_CHEAPEST_HOURS = 3
+
+CONF_BATTERY_CAPACITY = "battery_capacity"
+CONF_BATTERY_POWER = "battery_power"
+CONF_BATTERY_EFFICIENCY = "battery_efficiency"
+CONF_BATTERY_SOC_ENTITY = "battery_soc_entity"
+# round trip, in percent
+DEFAULT_BATTERY_EFFICIENCY = 90
+
+CONF_TARIFF = "tariff"
+
+# shares of a day's slots, in percent, counted as cheap and as expensive
+CONF_CHEAP_SHARE = "cheap_share"
+CONF_EXPENSIVE_SHARE = "expensive_share"
+DEFAULT_CHEAP_SHARE = 25
+DEFAULT_EXPENSIVE_SHARE = 25
@@ -1,64 +1,162 @@
 """DataUpdateCoordinator for the integration."""
 
 from __future__ import annotations
-from random import random
+from array import array
+from bisect import bisect_left
+import logging
+from time import perf_counter
 from typing import Any
-import json
 from collections.abc import Callable
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from math import inf
 from typing import TYPE_CHECKING
-from zoneinfo import ZoneInfo
-
-import aiohttp
-
 
 from homeassistant.const import CONF_CURRENCY
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LOGGER
-from .utils import TimeRangePrice
+from .const import (
+    CONF_BASE_PRICE,
+    CONF_BATTERY_CAPACITY,
+    CONF_BATTERY_EFFICIENCY,
+    CONF_BATTERY_POWER,
+    CONF_BATTERY_SOC_ENTITY,
+    CONF_CHEAP_SHARE,
+    CONF_CHEAPEST_HOURS,
+    CONF_EXPENSIVE_SHARE,
+    CONF_RETENTION_DAYS,
+    CONF_SERIES,
+    CONF_TARIFF,
+    DEFAULT_BATTERY_EFFICIENCY,
+    DEFAULT_CHEAP_SHARE,
+    DEFAULT_CHEAPEST_HOURS,
+    DEFAULT_EXPENSIVE_SHARE,
+    DEFAULT_RETENTION_DAYS,
+    DEFAULT_SERIES,
+    DOMAIN,
+    LOGGER,
+    METER_ZONES,
+    kiev_tz,
+)
+from .battery import BatteryConfig, BatteryPlan, BatteryPlanner
+from .series import PriceSeries
+from .levels import DayLevels, LevelState, LevelTimeline
+from .rolling import RollingPrices
+from .snapshot import PriceSnapshot, household_prices
+from .source import DAMPriceSource
+from .stats import CacheStats, TimingStats
+from .tariff import TariffSchedule
+from .timeline import PriceTimeline
+from .windows import PriceWindow, cheapest_slots, cheapest_window
 
 if TYPE_CHECKING:
     from . import DAMConfigEntry
 
-kiev_tz = ZoneInfo("Europe/Kiev")
 
-class DAMDataUpdateCoordinator(DataUpdateCoordinator[list[TimeRangePrice]]):
-    """A DAM Data Update Coordinator."""
 
-    config_entry: DAMConfigEntry
-    updated_at: datetime | None = None
+class DAMDataUpdateCoordinator(DataUpdateCoordinator[dict[date, PriceTimeline]]):
+    """A DAM Data Update Coordinator.
 
-    pricesDayData: dict[str, list[TimeRangePrice]]
-    updateMinute: int = 0.0
-    updateSecond: int = 0.0
+    One per config entry, for the values that depend on the entry's meter,
+    tariff and options. The prices themselves come from the shared source.
+    """
 
-    def __init__(self, hass: HomeAssistant, config_entry: DAMConfigEntry) -> None:
-        """Initialize the coordinator."""
+    config_entry: DAMConfigEntry
+    setup_duration: float | None = None
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: DAMConfigEntry,
+        source: DAMPriceSource,
+    ) -> None:
+        """Initialize the coordinator and attach it to the source."""
         super().__init__(
             hass,
             LOGGER,
             config_entry=config_entry,
             name=DOMAIN,
         )
-        self.unsubHourly: Callable[[], None] | None = None
-        self.unsubSyncPrices: Callable[[], None] | None = None
-        self.pricesDayData = {}
-
-        self.updateMinute = int(random() * 59)
-        self.updateSecond = int(random() * 59)
+        self.unsubSlotUpdate: Callable[[], None] | None = None
+        self._snapshots: dict[
+            str, tuple[tuple[int, int | None, datetime], PriceSnapshot]
+        ] = {}
+        self.source = source
+        self.client = source.client
+        # the shared series this entry shows
+        self.series: dict[str, PriceSeries] = source.attach(
+            self,
+            [
+                key
+                for key in config_entry.data.get(CONF_SERIES, [])
+                if key != DEFAULT_SERIES
+            ],
+            int(config_entry.data.get(CONF_RETENTION_DAYS, DEFAULT_RETENTION_DAYS)),
+        )
+        # last value of each (series, topic) the entities were notified of
+        self._notified: dict[tuple[str, str], Any] = {}
+        self._rate_tables: dict[str, tuple[int, array]] = {}
+        self._household: dict[str, tuple[int, tuple[array, array]]] = {}
+        self._day_levels: dict[tuple[str, date], tuple[PriceTimeline, DayLevels]] = {}
+        self._levels: dict[str, tuple[int, LevelTimeline]] = {}
+        self.cheap_share = (
+            config_entry.data.get(CONF_CHEAP_SHARE, DEFAULT_CHEAP_SHARE) / 100
+        )
+        self.expensive_share = (
+            config_entry.data.get(CONF_EXPENSIVE_SHARE, DEFAULT_EXPENSIVE_SHARE) / 100
+        )
+        self._forecasts: dict[str, tuple[tuple[int, date], dict[str, Any]]] = {}
+        self._cheapest: dict[
+            str,
+            tuple[tuple[int, float], tuple[PriceWindow | None, PriceWindow | None]],
+        ] = {}
+        if tariff := config_entry.data.get(CONF_TARIFF):
+            self.tariff = TariffSchedule.from_config(tariff)
+        else:
+            self.tariff = TariffSchedule.preset(
+                config_entry.data.get(METER_ZONES) or "2"
+            )
+        self.cheapest_hours = float(
+            config_entry.data.get(CONF_CHEAPEST_HOURS, DEFAULT_CHEAPEST_HOURS)
+        )
+        self._battery_planners: dict[
+            tuple[str, BatteryConfig, int, float | None], BatteryPlanner
+        ] = {}
+        self.battery: BatteryConfig | None = None
+        if capacity := config_entry.data.get(CONF_BATTERY_CAPACITY):
+            power = config_entry.data.get(CONF_BATTERY_POWER) or capacity
+            self.battery = BatteryConfig(
+                capacity=capacity,
+                charge_power=power,
+                discharge_power=power,
+                efficiency=config_entry.data.get(
+                    CONF_BATTERY_EFFICIENCY, DEFAULT_BATTERY_EFFICIENCY
+                )
+                / 100,
+            )
+        self.cache_stats = {
+            name: CacheStats()
+            for name in ("snapshot", "forecast", "cheapest", "battery")
+        }
+        self.tick_stats = TimingStats()
+        self.next_refresh: datetime | None = None
 
     async def init(self):
-        await self.fetch_data(dt_util.utcnow())
-        await self.hourly_update(dt_util.utcnow())
-
-    def get_next_hourly_interval(self, now: datetime) -> datetime:
-        """Compute next time an update should occur."""
-        next_hour = dt_util.utcnow() + timedelta(hours=1)
+        """Start the timers and fetch the days missing from the cache."""
+        await self.slot_update(dt_util.utcnow())
+        await self.source.async_start()
+
+    def get_next_update_interval(self, now: datetime) -> datetime:
+        """Compute next time an update should occur.
+
+        Prices change on slot boundaries and zone rates when the tariff
+        says so, the sensors are updated on whichever comes first and at
+        least every hour.
+        """
+        now = dt_util.utcnow()
+        next_hour = now + timedelta(hours=1)
         next_run = datetime(
             next_hour.year,
             next_hour.month,
@@ -66,163 +164,407 @@ class DAMDataUpdateCoordinator(DataUpdateCoordinator[list[TimeRangePrice]]):
             next_hour.hour,
             tzinfo=dt_util.UTC,
         )
+        next_run = min(next_run, self.tariff.next_change(now, kiev_tz))
+        for series in self.series.values():
+            boundary = series.timeline.next_boundary(now.timestamp())
+            if boundary is not None and boundary < next_run.timestamp():
+                next_run = datetime.fromtimestamp(boundary, dt_util.UTC)
+
         LOGGER.debug("Next sensors update at %s", next_run)
         return next_run
 
     async def async_shutdown(self) -> None:
         """Cancel any scheduled call, and ignore new runs."""
         await super().async_shutdown()
-        if self.unsubHourly:
-            self.unsubHourly()
-            self.unsubHourly = None
+        if self.unsubSlotUpdate:
+            self.unsubSlotUpdate()
+            self.unsubSlotUpdate = None
 
-        if self.unsubSyncPrices:
-            self.unsubSyncPrices()
-            self.unsubSyncPrices = None
+        await self.source.async_detach(self)
 
-    async def hourly_update(self, now: datetime, retry: int = 3) -> None:
-        self.unsubHourly = async_track_point_in_utc_time(
-            self.hass, self.hourly_update, self.get_next_hourly_interval(now)
+    async def slot_update(self, now: datetime) -> None:
+        self.next_refresh = self.get_next_update_interval(now)
+        self.unsubSlotUpdate = async_track_point_in_utc_time(
+            self.hass, self.slot_update, self.next_refresh
         )
 
-        self.async_set_updated_data(self.pricesDayData)
+        today = now.astimezone(kiev_tz).date()
+        for series in self.series.values():
+            series.evict_days(today)
+        self.async_update_changed()
+
+    @property
+    def primary(self) -> PriceSeries:
+        """Return the series behind the main price sensors."""
+        return self.series[DEFAULT_SERIES]
+
+    @property
+    def updated_at(self) -> datetime | None:
+        """Return when prices were last fetched."""
+        return self.source.updated_at
+
+    @property
+    def next_fetch(self) -> datetime | None:
+        """Return when prices are fetched next."""
+        return self.source.next_fetch
+
+    def get_rolling(self) -> RollingPrices:
+        """Return the rolling aggregates of the main series."""
+        return self.source.get_rolling()
+
+    @property
+    def pricesDayData(self) -> dict[date, PriceTimeline]:
+        """Return the delivery days of the main series."""
+        return self.primary.days
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """Return the hit rate of the derived value caches and stores."""
+        total = CacheStats()
+        for stats in (
+            *self.cache_stats.values(),
+            *(series.store.stats for series in self.series.values()),
+        ):
+            total.hits += stats.hits
+            total.misses += stats.misses
+        return total.hit_rate
+
+    @property
+    def data_version(self) -> int:
+        """Return a number that changes whenever any series changes."""
+        return sum(series.data_version for series in self.series.values())
+
+    def get_derived(self, series: str, topic: str) -> Any:
+        """Return the current value of a topic entities of a series depend on.
+
+        Topics are the fields of the price snapshot and a few values that
+        are computed apart from it.
+        """
+        match topic:
+            case "available":
+                return bool(self.get_data_current_day(series))
+            case "updated_at":
+                return self.updated_at
+            case "forecast":
+                return self.get_forecast(series)
+            case "cheapest":
+                return self.get_cheapest(series)
+            case "level":
+                return self.get_price_level(series)
+            case "rolling":
+                return self.get_rolling().version
+            case "battery":
+                if self.battery is None:
+                    return None
+                return self.get_battery_plan(
+                    self.battery, self.get_battery_soc(), series
+                )[1]
+            case _:
+                return getattr(self.get_snapshot(series), topic)
+
+    def _topic_changed(
+        self, key: tuple[str, str], changed: dict[tuple[str, str], bool]
+    ) -> bool:
+        """Return if a topic changed since it was last notified."""
+        if key not in changed:
+            value = self.get_derived(*key)
+            changed[key] = key not in self._notified or self._notified[key] != value
+            self._notified[key] = value
+        return changed[key]
+
+    @callback
+    def async_update_changed(self) -> None:
+        """Notify only the entities whose values changed.
+
+        Entities listen with their series and topics as context. Each topic
+        is computed once per call and compared with the value last
+        notified, so a slot boundary only writes the state of the sensors
+        showing the current slot and a new day all of them.
+        """
+        started = perf_counter()
+        self.data = self.pricesDayData
+        notify_all = not self.last_update_success
+        self.last_update_success = True
+        changed: dict[tuple[str, str], bool] = {}
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None:
+                update_callback()
+                continue
+
+            series, topics = context
+            # all topics are compared to keep the notified values current
+            if [
+                topic
+                for topic in topics
+                if self._topic_changed((series, topic), changed)
+            ] or notify_all:
+                update_callback()
+
+        self.tick_stats.record(perf_counter() - started)
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                "Notified changes of %s in %.2f ms",
+                [key for key, value in changed.items() if value],
+                self.tick_stats.last * 1000,
+            )
 
-    async def fetch_data(self, now: datetime) -> None:
-        """Fetch data."""
-        next_day = now + timedelta(days=1)
-        next_run = datetime(
-            next_day.year,
-            next_day.month,
-            next_day.day,
-            20,
-            minute=self.updateMinute,
-            second=self.updateSecond,
-            tzinfo=kiev_tz,
-        )
-        LOGGER.debug("Next rdn update at %s", next_run)
-        kiev_now = now.astimezone(kiev_tz)
+    def get_series(self, key: str | None = None) -> PriceSeries:
+        """Return a series, the main one by default."""
+        return self.series[key] if key else self.primary
 
-        kiev_time_str = kiev_now.strftime('%d.%m.%Y')
-        kiev_time_tomorrow_str = next_day.astimezone(kiev_tz).strftime('%d.%m.%Y')
+    def get_all_price_entries(self, series: str | None = None) -> PriceTimeline:
+        """Return all price entries."""
+        return self.get_series(series).timeline
 
-        if self.unsubSyncPrices:
-            self.unsubSyncPrices()
-            self.unsubSyncPrices = None
+    def get_data_current_day(self, series: str | None = None) -> PriceTimeline:
+        """Return the current day data."""
+        current_day = dt_util.utcnow().astimezone(kiev_tz).date()
+        return self.get_series(series).get_day(current_day)
+
+    def get_snapshot(self, series: str | None = None) -> PriceSnapshot:
+        """Return the derived prices, recomputed only on a new slot or data."""
+        now = dt_util.utcnow()
+        price_series = self.get_series(series)
+        timeline = price_series.timeline
+        index = timeline.index_at(now.timestamp())
+        zone_rate = self.get_current_zone_rate()
+        key = (price_series.data_version, index, zone_rate)
+
+        cached = self._snapshots.get(price_series.key)
+        self.cache_stats["snapshot"].record(cached is not None and cached[0] == key)
+        if cached is None or cached[0] != key:
+            cached = self._snapshots[price_series.key] = (
+                key,
+                PriceSnapshot.build(
+                    timeline,
+                    self.get_data_current_day(series),
+                    index,
+                    zone_rate,
+                    self.config_entry.data.get(CONF_BASE_PRICE),
+                    kiev_tz,
+                ),
+            )
 
-        self.unsubSyncPrices = async_track_point_in_utc_time(
-            self.hass, self.fetch_data, next_run
-        )
+        return cached[1]
+
+    def get_forecast(self, series: str | None = None) -> dict[str, Any]:
+        """Return the prices of today and tomorrow, rebuilt only on new data."""
+        price_series = self.get_series(series)
+        today = dt_util.utcnow().astimezone(kiev_tz).date()
+        key = (price_series.data_version, today)
+
+        cached = self._forecasts.get(price_series.key)
+        self.cache_stats["forecast"].record(cached is not None and cached[0] == key)
+        if cached is None or cached[0] != key:
+            cached = self._forecasts[price_series.key] = (
+                key,
+                {
+                    name: self.get_day_forecast(price_series, day)
+                    for name, day in (
+                        ("today", today),
+                        ("tomorrow", today + timedelta(days=1)),
+                    )
+                },
+            )
 
-        if not self.pricesDayData.get(kiev_time_str):
-            todayData = await self.api_call(now)
-
-            if todayData: 
-                self.pricesDayData[kiev_time_str] = todayData
-                self.updated_at = now
-        
-        if kiev_now.hour >= 20 and not self.pricesDayData.get(kiev_time_tomorrow_str):
-            tomorrowData = await self.api_call(next_day)
-
-            if tomorrowData:
-                self.pricesDayData[kiev_time_tomorrow_str] = tomorrowData
-                self.updated_at = now
-        elif kiev_now.hour < 20:
-            next_run_today_later = datetime(
-                kiev_now.year,
-                kiev_now.month,
-                kiev_now.day,
-                20,
-                minute=self.updateMinute,
-                second=self.updateSecond,
-                tzinfo=kiev_tz,
+        return cached[1]
+
+    def get_day_forecast(
+        self, price_series: PriceSeries, day: date
+    ) -> dict[str, Any] | None:
+        """Return the market and household prices of a delivery day."""
+        prices = price_series.get_day(day)
+        if (forecast := prices.as_dict(kiev_tz)) is None:
+            return None
+
+        if self.config_entry.data.get(CONF_BASE_PRICE) is not None:
+            buy, sell = self.get_household_prices(price_series.key)
+            first = bisect_left(price_series.timeline.starts, prices.starts[0])
+            last = first + len(prices)
+            forecast["household_prices"] = buy[first:last].tolist()
+            forecast["household_selling_prices"] = sell[first:last].tolist()
+        return forecast
+
+    def get_cheapest(
+        self, series: str | None = None
+    ) -> tuple[PriceWindow | None, PriceWindow | None]:
+        """Return the cheapest window and slots of the configured length.
+
+        Both are searched from the current slot on, so they are only
+        recomputed when the prices change or a slot has passed.
+        """
+        price_series = self.get_series(series)
+        timeline = price_series.timeline
+        now = dt_util.utcnow().timestamp()
+        index = timeline.index_at(now)
+        earliest = now if index is None else timeline.starts[index]
+        key = (price_series.data_version, earliest)
+
+        cached = self._cheapest.get(price_series.key)
+        self.cache_stats["cheapest"].record(cached is not None and cached[0] == key)
+        if cached is None or cached[0] != key:
+            duration = self.cheapest_hours * 3600
+            cached = self._cheapest[price_series.key] = (
+                key,
+                (
+                    cheapest_window(timeline, duration, earliest),
+                    cheapest_slots(timeline, duration, earliest),
+                ),
             )
-            if self.unsubSyncPrices:
-                self.unsubSyncPrices()
-                self.unsubSyncPrices = None
 
-            self.unsubSyncPrices = async_track_point_in_utc_time(
-                self.hass, self.fetch_data, next_run_today_later
+        return cached[1]
+
+    def get_levels(self, series: str | None = None) -> LevelTimeline:
+        """Return the price level of every slot of a series.
+
+        The thresholds and levels of a day are computed once when it lands
+        and reused until it is replaced or evicted.
+        """
+        price_series = self.get_series(series)
+        cached = self._levels.get(price_series.key)
+        if cached is None or cached[0] != price_series.data_version:
+            days: list[DayLevels] = []
+            for day in sorted(price_series.days):
+                prices = price_series.days[day]
+                day_levels = self._day_levels.get((price_series.key, day))
+                if day_levels is None or day_levels[0] is not prices:
+                    day_levels = self._day_levels[(price_series.key, day)] = (
+                        prices,
+                        DayLevels.build(prices, self.cheap_share, self.expensive_share),
+                    )
+                days.append(day_levels[1])
+            for stale in [
+                key
+                for key in self._day_levels
+                if key[0] == price_series.key and key[1] not in price_series.days
+            ]:
+                del self._day_levels[stale]
+            cached = self._levels[price_series.key] = (
+                price_series.data_version,
+                LevelTimeline(price_series.timeline, days),
             )
 
-    async def api_call(self, now: datetime, retry: int = 3):
-        """Make api call to retrieve data with retry if failure."""
-        ## array of numbers
-        data: list[float] = []
-        kiev_time_str = now.astimezone(kiev_tz).strftime('%d.%m.%Y')
-        
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"https://www.oree.com.ua/index.php/PXS/get_pxs_hdata/{kiev_time_str}/DAM/2",
-                    headers={'accept': 'application/json, text/javascript, */*; q=0.01', 'x-requested-with': 'XMLHttpRequest'}
-                ) as response:
-                    response.raise_for_status()
-                    text = await response.text()
-                    dataJson = json.loads(text)
-
-                    if pricesData := dataJson.get("pricesData"):
-                        data = pricesData
-
-            except aiohttp.ClientError as error:
-                LOGGER.debug("Connection error: %s", error)
-                self.async_set_update_error(error)
-
-        if data and len(data) == 24:
-            priceRanges : list[TimeRangePrice] = []
-            for i, value in enumerate(data):
-                start = now.replace(hour=i, minute=0, second=0, microsecond=0, tzinfo=kiev_tz).timestamp()
-                end = start + timedelta(hours=1).total_seconds()
-                priceRanges.append(TimeRangePrice(start = start, end = end, value = value / 1000))
-
-            return priceRanges
-
-        self.async_set_update_error(Exception("No current day data"))
-        return None
-    
-    def get_all_price_entries(self) -> list[TimeRangePrice]:
-        """Return all price entries."""
-        entries: list[TimeRangePrice] = []
+        return cached[1]
 
-        for del_period in self.pricesDayData.values():
-            entries.extend(del_period)
+    def get_price_level(self, series: str | None = None) -> LevelState:
+        """Return the price level of the current slot and its next change."""
+        return self.get_levels(series).state_at(dt_util.utcnow().timestamp())
+
+    def get_current_zone_rate(self) -> float:
+        """Return the zone rate in force now.
+
+        Rates may change within a slot, so the current rate is asked from
+        the schedule rather than the slot averages of the rate table.
+        """
+        return self.get_zone_rate(dt_util.utcnow())
+
+    def get_zone_rate(self, when: datetime) -> float:
+        """Return the zone rate at a point in time."""
+        return self.tariff.rate_at(when, kiev_tz)
+
+    def get_rate_table(self, series: str | None = None) -> array:
+        """Return the average zone rate of every slot, built once per data."""
+        price_series = self.get_series(series)
+        cached = self._rate_tables.get(price_series.key)
+        if cached is None or cached[0] != price_series.data_version:
+            cached = self._rate_tables[price_series.key] = (
+                price_series.data_version,
+                self.tariff.rates(price_series.timeline, kiev_tz),
+            )
+        return cached[1]
+
+    def get_household_prices(self, series: str | None = None) -> tuple[array, array]:
+        """Return the household buy and sell price of every slot of a series.
+
+        Both are computed in one pass over the rate table and kept until the
+        prices change. Without a configured base price both are the market
+        price.
+        """
+        price_series = self.get_series(series)
+        values = price_series.timeline.values
+        base_price = self.config_entry.data.get(CONF_BASE_PRICE)
+        if base_price is None:
+            return values, values
+
+        cached = self._household.get(price_series.key)
+        if cached is None or cached[0] != price_series.data_version:
+            cached = self._household[price_series.key] = (
+                price_series.data_version,
+                household_prices(values, self.get_rate_table(series), base_price),
+            )
+        return cached[1]
+
+    def get_battery_plan(
+        self,
+        battery: BatteryConfig,
+        soc: float,
+        series: str | None = None,
+    ) -> tuple[PriceTimeline, BatteryPlan]:
+        """Return the battery plan from the current slot to the last known one.
+
+        The planner is kept while the battery, its starting state of charge
+        and the current slot stay the same, so newly published prices only
+        add their slots to the plan.
+        """
+        price_series = self.get_series(series)
+        timeline = price_series.timeline
+        now = dt_util.utcnow().timestamp()
+        index = timeline.index_at(now)
+        horizon = timeline.range_slice(
+            now if index is None else timeline.starts[index], inf
+        )
+        key = (
+            price_series.key,
+            battery,
+            battery.level(soc),
+            horizon.starts[0] if horizon else None,
+        )
 
-        return entries
+        planner = self._battery_planners.get(key)
+        self.cache_stats["battery"].record(
+            planner is not None and len(planner) == len(horizon)
+        )
+        if planner is None or len(planner) > len(horizon):
+            # plans starting at an earlier slot are of no use any more
+            for stale in [
+                other for other in self._battery_planners if other[3] != key[3]
+            ]:
+                del self._battery_planners[stale]
+            # the grid is sized for the shortest slot known when planning
+            # starts, shorter slots published later are rounded down more
+            slot = min(
+                (end - start for start, end in zip(horizon.starts, horizon.ends)),
+                default=3600,
+            )
+            planner = self._battery_planners[key] = BatteryPlanner(
+                battery, soc, slot / 3600
+            )
 
-    def get_data_current_day(self) -> list[TimeRangePrice]:
-        """Return the current day data."""
-        current_day = dt_util.utcnow().astimezone(kiev_tz).strftime('%d.%m.%Y')
-        delivery_period = self.pricesDayData.get(current_day)
+        if len(planner) < len(horizon):
+            added = horizon.range_slice(horizon.starts[len(planner)], inf)
+            # the horizon is the tail of the timeline
+            offset = len(timeline) - len(added)
+            buy, sell = self.get_household_prices(series)
+            planner.extend(
+                [(end - start) / 3600 for start, end in zip(added.starts, added.ends)],
+                buy[offset:],
+                sell[offset:],
+            )
 
-        if delivery_period:
-            return delivery_period
+        return horizon, planner.plan()
 
-        return []
+    def get_battery_soc(self) -> float:
+        """Return the state of charge of the configured battery in kWh."""
+        if self.battery is None:
+            return 0.0
 
-    def get_current_zone_rate(self) -> float:
-        """Return the current zone rate."""
-        meter_zones = self.config_entry.data.get("meter_zones") or "2"
-
-        match meter_zones:
-            case "1":
-                return 1.0
-            case "2":
-                hour = dt_util.utcnow().astimezone(kiev_tz).hour
-                # from 23:00 to 7:00 — 0.5
-                if hour >= 23 or hour < 7:
-                    return 0.5
-
-                # from 7:00 to 23:00 — 1.0
-                return 1.0
-            case "3":
-                hour = dt_util.utcnow().astimezone(kiev_tz).hour
-
-                # from 23:00 to 7:00 — 0.4
-                if hour >= 23 or hour < 7:
-                    return 0.4
-                # from 8:00 to 11:00 and from 20:00 to 22:00 — 1.5
-                elif (8 <= hour <= 11) or (20 <= hour <= 22):
-                    return 1.5
-                # from 7:00 to 8:00, from 11:00 to 20:00 and from 22:00 to 23:00 — 1.0
-                else:
-                    return 1.0
+        if (entity_id := self.config_entry.data.get(CONF_BATTERY_SOC_ENTITY)) and (
+            state := self.hass.states.get(entity_id)
+        ):
+            try:
+                return float(state.state) / 100 * self.battery.capacity
+            except ValueError:
+                LOGGER.debug("Invalid state of charge %s", state.state)
 
+        return 0.0
@@ -0,0 +1,53 @@
+"""Times at which known prices cross a threshold or enter the cheapest hours."""
+
+from __future__ import annotations
+
+from datetime import datetime, tzinfo
+from itertools import groupby
+
+from .timeline import PriceTimeline
+
+
+def runs(timeline: PriceTimeline, selected: list[bool]) -> list[float]:
+    """Return the starts of the runs of consecutive selected slots."""
+    result: list[float] = []
+    inside = False
+    previous_end: float | None = None
+    for start, end, chosen in zip(timeline.starts, timeline.ends, selected):
+        if chosen and (not inside or start != previous_end):
+            result.append(start)
+        inside = chosen
+        previous_end = end
+    return result
+
+
+def threshold_crossings(
+    timeline: PriceTimeline, threshold: float, below: bool = True
+) -> list[float]:
+    """Return when the price drops below, or rises above, a threshold."""
+    if below:
+        return runs(timeline, [value < threshold for value in timeline.values])
+    return runs(timeline, [value > threshold for value in timeline.values])
+
+
+def cheapest_hours_starts(
+    timeline: PriceTimeline, hours: float, tz: tzinfo
+) -> list[float]:
+    """Return when a slot among the cheapest hours of its day starts a run.
+
+    The cheapest slots of every delivery day are picked until they add up
+    to the hours, ties go to the earlier slot.
+    """
+    selected = [False] * len(timeline)
+    days = groupby(
+        range(len(timeline)),
+        key=lambda index: datetime.fromtimestamp(timeline.starts[index], tz).date(),
+    )
+    for _, slots in days:
+        left = hours * 3600
+        for index in sorted(slots, key=timeline.values.__getitem__):
+            if left <= 0:
+                break
+            selected[index] = True
+            left -= timeline.ends[index] - timeline.starts[index]
+    return runs(timeline, selected)
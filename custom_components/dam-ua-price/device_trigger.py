@@ -0,0 +1,206 @@
+"""Device triggers on known price crossings."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_SERIES, DOMAIN, LOGGER, kiev_tz
+
+if TYPE_CHECKING:
+    from .coordinator import DAMDataUpdateCoordinator
+
+CONF_THRESHOLD = "threshold"
+CONF_HOURS = "hours"
+
+TRIGGER_PRICE_BELOW = "price_below"
+TRIGGER_PRICE_ABOVE = "price_above"
+TRIGGER_CHEAPEST_HOURS = "cheapest_hours"
+# trigger type, the crossings kind and the field with its value
+TRIGGER_TYPES = {
+    TRIGGER_PRICE_BELOW: ("below", CONF_THRESHOLD),
+    TRIGGER_PRICE_ABOVE: ("above", CONF_THRESHOLD),
+    TRIGGER_CHEAPEST_HOURS: ("cheapest", CONF_HOURS),
+}
+
+THRESHOLD_SCHEMA = vol.Schema(
+    {vol.Required(CONF_THRESHOLD): vol.All(vol.Coerce(float), vol.Range(min=0))}
+)
+HOURS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOURS): vol.All(
+            vol.Coerce(float), vol.Range(min=0.25, max=24)
+        )
+    }
+)
+
+
+def has_value(config: ConfigType) -> ConfigType:
+    """Require the field the trigger type needs."""
+    field = TRIGGER_TYPES[config[CONF_TYPE]][1]
+    if field not in config:
+        raise vol.Invalid(f"{field} is required for {config[CONF_TYPE]}")
+    return config
+
+
+TRIGGER_SCHEMA = vol.All(
+    DEVICE_TRIGGER_BASE_SCHEMA.extend(
+        {
+            vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+            vol.Optional(CONF_THRESHOLD): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+            vol.Optional(CONF_HOURS): vol.All(
+                vol.Coerce(float), vol.Range(min=0.25, max=24)
+            ),
+        }
+    ),
+    has_value,
+)
+
+
+def get_coordinator(hass: HomeAssistant, device_id: str) -> DAMDataUpdateCoordinator:
+    """Return the coordinator behind a device."""
+    if device := dr.async_get(hass).async_get(device_id):
+        for entry_id in device.config_entries:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if (
+                entry
+                and entry.domain == DOMAIN
+                and entry.state is ConfigEntryState.LOADED
+            ):
+                return entry.runtime_data
+    raise HomeAssistantError(f"No loaded {DOMAIN} entry for device {device_id}")
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, Any]]:
+    """List the device triggers of the price device."""
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DEVICE_ID: device_id,
+            CONF_DOMAIN: DOMAIN,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_TYPES
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    """Return the price or the hours a trigger needs."""
+    if config[CONF_TYPE] == TRIGGER_CHEAPEST_HOURS:
+        return {"extra_fields": HOURS_SCHEMA}
+    return {"extra_fields": THRESHOLD_SCHEMA}
+
+
+class PriceTrigger:
+    """One timer per future crossing of a trigger.
+
+    The crossings are computed by the price source when prices arrive, so
+    the timers are only set up again when the prices change.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: DAMDataUpdateCoordinator,
+        config: ConfigType,
+        action: TriggerActionType,
+        trigger_info: TriggerInfo,
+    ) -> None:
+        """Initialize the trigger."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._config = config
+        self._job = HassJob(action)
+        self._trigger_data = trigger_info["trigger_data"]
+        self._kind, field = TRIGGER_TYPES[config[CONF_TYPE]]
+        self._value: float = config[field]
+        self._timers: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_schedule(self) -> None:
+        """Set up a timer for every crossing still to come."""
+        self.async_cancel()
+        now = dt_util.utcnow().timestamp()
+        for start in self._coordinator.source.get_crossings(
+            self._kind, self._value
+        ):
+            if start > now:
+                self._timers.append(
+                    async_track_point_in_utc_time(
+                        self._hass,
+                        partial(self._async_fire, start),
+                        datetime.fromtimestamp(start, dt_util.UTC),
+                    )
+                )
+        LOGGER.debug(
+            "%s %s: %s timers", self._config[CONF_TYPE], self._value, len(self._timers)
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel all timers."""
+        while self._timers:
+            self._timers.pop()()
+
+    @callback
+    def _async_fire(self, start: float, now: datetime) -> None:
+        price = self._coordinator.primary.timeline.price_at(start)
+        self._hass.async_run_hass_job(
+            self._job,
+            {
+                "trigger": {
+                    **self._trigger_data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: self._config[CONF_DEVICE_ID],
+                    CONF_TYPE: self._config[CONF_TYPE],
+                    "start": datetime.fromtimestamp(start, kiev_tz),
+                    "price": price,
+                    "description": f"{self._config[CONF_TYPE]} {self._value:g}",
+                }
+            },
+        )
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a trigger."""
+    coordinator = get_coordinator(hass, config[CONF_DEVICE_ID])
+    trigger = PriceTrigger(hass, coordinator, config, action, trigger_info)
+    trigger.async_schedule()
+    # the known days only change together with the price forecast
+    remove_listener: Callable[[], None] = coordinator.async_add_listener(
+        trigger.async_schedule, (DEFAULT_SERIES, frozenset({"forecast"}))
+    )
+
+    @callback
+    def async_remove() -> None:
+        remove_listener()
+        trigger.async_cancel()
+
+    return async_remove
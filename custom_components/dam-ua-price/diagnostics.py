@@ -0,0 +1,84 @@
+"""Diagnostics support for the integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import DAMConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: DAMConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+    source = coordinator.source
+    client = coordinator.client.stats
+
+    return {
+        "config": dict(entry.data),
+        "client": {
+            "requests": client.requests,
+            "failures": client.failures,
+            "retries": client.retries,
+            "rejected": client.rejected,
+            "last_rejection": client.last_rejection,
+            "average_latency": client.average_latency,
+            "last_latency": client.last_latency,
+            "latency_histogram": client.latency.as_dict(),
+        },
+        "caches": {
+            name: {**asdict(stats), "hit_rate": stats.hit_rate}
+            for name, stats in coordinator.cache_stats.items()
+        },
+        "series": {
+            key: {
+                "days": [day.isoformat() for day in sorted(series.days)],
+                "slots": len(series.timeline),
+                "memory_size": series.memory_size,
+                "data_version": series.data_version,
+                "updated_at": series.updated_at,
+                "store": {
+                    **asdict(series.store.stats),
+                    "hit_rate": series.store.stats.hit_rate,
+                    "loaded_days": series.store.loaded_days,
+                },
+                "statistics": {
+                    "statistic_id": series.statistics.statistic_id,
+                    "imported_until": (
+                        dt_util.utc_from_timestamp(series.statistics.imported_until)
+                        if series.statistics.imported_until is not None
+                        else None
+                    ),
+                },
+            }
+            for key, series in coordinator.series.items()
+        },
+        "timing": {
+            "setup_duration": coordinator.setup_duration,
+            "tick": {
+                **asdict(coordinator.tick_stats),
+                "average": coordinator.tick_stats.average,
+            },
+        },
+        "schedule": {
+            "updated_at": coordinator.updated_at,
+            "next_fetch": coordinator.next_fetch,
+            "next_refresh": coordinator.next_refresh,
+            "publication_latency": (
+                source.publication_latency.total_seconds()
+                if source.publication_latency
+                else None
+            ),
+            "publication_polls": source.publication_polls,
+        },
+        "source": {
+            "entries": len(source.coordinators),
+            "series": sorted(source.series),
+            "retention_days": source.retention_days,
+        },
+    }
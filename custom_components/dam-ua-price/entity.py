@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DEFAULT_SERIES, DOMAIN, SERIES
 from .coordinator import DAMDataUpdateCoordinator
+from .snapshot import PriceSnapshot
+
+
+@dataclass(frozen=True, kw_only=True)
+class DAMEntityDescription(EntityDescription):
+    """Describes a DAM entity."""
+
+    # derived values the entity shows, it is only written when one changes
+    depends_on: frozenset[str] | None = None
 
 
 class DAMBaseEntity(CoordinatorEntity[DAMDataUpdateCoordinator]):
@@ -18,15 +29,41 @@ class DAMBaseEntity(CoordinatorEntity[DAMDataUpdateCoordinator]):
     def __init__(
         self,
         coordinator: DAMDataUpdateCoordinator,
-        entity_description: EntityDescription
+        entity_description: EntityDescription,
+        series: str | None = None,
     ) -> None:
         """Initiate base entity."""
-        super().__init__(coordinator)
+        context = None
+        if isinstance(entity_description, DAMEntityDescription) and (
+            entity_description.depends_on is not None
+        ):
+            context = (
+                series or DEFAULT_SERIES,
+                frozenset({"available", *entity_description.depends_on}),
+            )
+        super().__init__(coordinator, context)
         self.entity_description = entity_description
-        self._attr_unique_id = f"${DOMAIN}-{entity_description.key}"
+        self.series = series
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{entry_id}-{entity_description.key}"
+        if series:
+            self._attr_unique_id += f"-{series}"
+            self._attr_translation_placeholders = {"series": SERIES[series]}
 
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN)},
-            name=f"DAM Electricity Prices",
+            identifiers={(DOMAIN, entry_id)},
+            name=coordinator.config_entry.title,
             entry_type=DeviceEntryType.SERVICE,
         )
+
+    @property
+    def available(self) -> bool:
+        """Return if prices of the current day are known."""
+        return super().available and bool(
+            self.coordinator.get_data_current_day(self.series)
+        )
+
+    @property
+    def snapshot(self) -> PriceSnapshot:
+        """Return the derived prices of the entity's series."""
+        return self.coordinator.get_snapshot(self.series)
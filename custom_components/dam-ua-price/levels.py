@@ -0,0 +1,116 @@
+"""Classification of price slots into cheap, normal and expensive."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from enum import StrEnum
+from math import ceil
+
+from .timeline import PriceTimeline
+
+
+class PriceLevel(StrEnum):
+    """How a slot's price ranks within its delivery day."""
+
+    CHEAP = "cheap"
+    NORMAL = "normal"
+    EXPENSIVE = "expensive"
+
+
+# array codes of the levels, in the order of the enum
+LEVELS = tuple(PriceLevel)
+
+
+def percentile(ordered: list[float], share: float) -> float:
+    """Return the price below which a share of the sorted prices lie."""
+    return ordered[max(ceil(share * len(ordered)), 1) - 1]
+
+
+def top_percentile(ordered: list[float], share: float) -> float:
+    """Return the price above which a share of the sorted prices lie."""
+    return ordered[-max(ceil(share * len(ordered)), 1)]
+
+
+@dataclass(frozen=True, slots=True)
+class DayLevels:
+    """Thresholds of a delivery day and the level of each of its slots.
+
+    Slots at or below the cheap threshold are cheap, slots at or above the
+    expensive one expensive, both thresholds are percentiles of the day.
+    """
+
+    cheap_below: float
+    expensive_above: float
+    levels: array
+
+    @classmethod
+    def build(
+        cls, prices: PriceTimeline, cheap_share: float, expensive_share: float
+    ) -> DayLevels:
+        """Compute the thresholds and levels of a day."""
+        ordered = sorted(prices.values)
+        cheap_below = percentile(ordered, cheap_share)
+        expensive_above = top_percentile(ordered, expensive_share)
+        levels = array(
+            "b",
+            [
+                0 if value <= cheap_below else 2 if value >= expensive_above else 1
+                for value in prices.values
+            ],
+        )
+        return cls(cheap_below, expensive_above, levels)
+
+
+@dataclass(frozen=True, slots=True)
+class LevelState:
+    """The level of the current slot and when it changes next."""
+
+    level: PriceLevel | None = None
+    cheap_below: float | None = None
+    expensive_above: float | None = None
+    next_change: float | None = None
+    next_level: PriceLevel | None = None
+
+
+class LevelTimeline:
+    """Levels of every slot of a timeline with the slots where they change."""
+
+    def __init__(self, timeline: PriceTimeline, days: list[DayLevels]) -> None:
+        """Join the levels of consecutive days."""
+        self.timeline = timeline
+        self.days = days
+        self.levels = array("b")
+        # first slot of every day, to find the thresholds of a slot
+        self._day_starts: list[int] = []
+        for day in days:
+            self._day_starts.append(len(self.levels))
+            self.levels.extend(day.levels)
+        levels = self.levels
+        self.changes = [
+            index for index in range(1, len(levels)) if levels[index] != levels[index - 1]
+        ]
+
+    def state_at(self, timestamp: float) -> LevelState:
+        """Return the level state at a point in time."""
+        timeline = self.timeline
+        if (index := timeline.index_at(timestamp)) is None:
+            return LevelState()
+
+        day = self.days[bisect_right(self._day_starts, index) - 1]
+        next_change: float | None = None
+        next_level: PriceLevel | None = None
+        position = bisect_right(self.changes, index)
+        if position < len(self.changes):
+            change = self.changes[position]
+            next_change = timeline.starts[change]
+            next_level = LEVELS[self.levels[change]]
+
+        return LevelState(
+            level=LEVELS[self.levels[index]],
+            cheap_below=day.cheap_below,
+            expensive_above=day.expensive_above,
+            next_change=next_change,
+            next_level=next_level,
+        )
@@ -0,0 +1,81 @@
+"""Validation of OREE price responses."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import date, tzinfo
+from itertools import repeat
+from math import isnan
+from operator import truediv
+from typing import Any
+
+from .timeline import PriceTimeline, slot_grid
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# bounds of a plausible DAM price in UAH/MWh, the market caps lie well inside
+PRICE_MIN = 0.0
+PRICE_MAX = 100_000.0
+
+
+class InvalidPrices(ValueError):
+    """A price response that cannot be used, the message gives the reason."""
+
+
+def parse_prices(data: Any, day: date, tz: tzinfo) -> PriceTimeline | None:
+    """Validate a decoded price response and build the timeline of the day.
+
+    Prices are checked in one pass over the decoded list while they are
+    copied into the timeline array. Returns None while the day is not
+    published yet.
+    """
+    if not isinstance(data, dict):
+        raise InvalidPrices(f"expected an object, got {type(data).__name__}")
+
+    prices = data.get("pricesData")
+    if not prices:
+        return None
+    if not isinstance(prices, list):
+        raise InvalidPrices(f"pricesData is a {type(prices).__name__}, not a list")
+    if slot_grid(day, len(prices), tz) is None:
+        raise InvalidPrices(
+            f"{len(prices)} prices are not an hourly, half-hourly or "
+            f"quarter-hourly grid of {day}"
+        )
+
+    try:
+        # array takes bools for 0 and 1, they are no prices though
+        if any(value.__class__ is bool for value in prices):
+            raise TypeError
+        values = array("d", prices)
+    except (TypeError, OverflowError):
+        for index, value in enumerate(prices):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise InvalidPrices(
+                    f"price {index} is {value!r}, not a number"
+                ) from None
+            if not PRICE_MIN <= value <= PRICE_MAX:
+                raise InvalidPrices(
+                    f"price {index} is {value}, outside {PRICE_MIN:g} to {PRICE_MAX:g}"
+                ) from None
+        raise
+
+    if any(map(isnan, values)) or not (
+        PRICE_MIN <= min(values) and max(values) <= PRICE_MAX
+    ):
+        index, value = next(
+            (index, value)
+            for index, value in enumerate(values)
+            if not PRICE_MIN <= value <= PRICE_MAX
+        )
+        raise InvalidPrices(
+            f"price {index} is {value}, outside {PRICE_MIN:g} to {PRICE_MAX:g}"
+        )
+
+    # UAH/MWh to UAH/kWh
+    return PriceTimeline.for_day(
+        day, array("d", map(truediv, values, repeat(1000.0))), tz
+    )
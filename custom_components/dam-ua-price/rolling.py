@@ -0,0 +1,152 @@
+"""Rolling price aggregates over the recent delivery days."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import date, timedelta
+from math import ceil
+
+# percentiles are kept to a resolution of 0.01 UAH/kWh, up to PRICE_MAX
+BUCKET_SIZE = 0.01
+BUCKETS = 10_001
+WINDOWS = (7, 30)
+QUANTILES = (0.1, 0.5, 0.9)
+
+
+class QuantileTree:
+    """Counts of prices in fixed buckets, as a Fenwick tree.
+
+    Adding, removing and finding the k-th smallest price take a logarithmic
+    number of steps in the number of buckets, whatever the number of prices.
+    """
+
+    def __init__(self, size: int = BUCKETS) -> None:
+        """Initialize an empty tree."""
+        self._tree = array("l", bytes(array("l").itemsize * (size + 1)))
+        self._size = size
+        self._top = 1 << (size.bit_length() - 1)
+        self.count = 0
+
+    def bucket(self, value: float) -> int:
+        """Return the bucket of a price."""
+        return min(max(round(value / BUCKET_SIZE), 0), self._size - 1)
+
+    def add(self, values: array, sign: int = 1) -> None:
+        """Add the prices, or remove them with a sign of -1."""
+        tree = self._tree
+        size = self._size
+        for value in values:
+            index = self.bucket(value) + 1
+            while index <= size:
+                tree[index] += sign
+                index += index & -index
+        self.count += sign * len(values)
+
+    def kth(self, k: int) -> float:
+        """Return the k-th smallest price, counting from 1."""
+        tree = self._tree
+        position = 0
+        step = self._top
+        while step:
+            if position + step <= self._size and tree[position + step] < k:
+                position += step
+                k -= tree[position]
+            step >>= 1
+        return position * BUCKET_SIZE
+
+    def quantile(self, q: float) -> float | None:
+        """Return the price below which a share q of the prices lie."""
+        if not self.count:
+            return None
+        return self.kth(max(ceil(q * self.count), 1))
+
+
+class RollingPrices:
+    """Averages of the last 7 and 30 days and percentiles of the last 30.
+
+    Every day ending with today is summed up once when it arrives. When the
+    date changes only the days entering or leaving a window are added to or
+    taken from the running sums and the quantile tree, so no history is
+    scanned again. Days after today wait until they are in a window.
+    """
+
+    def __init__(self, windows: tuple[int, ...] = WINDOWS) -> None:
+        """Initialize empty aggregates."""
+        self.windows = windows
+        self.longest = max(windows)
+        self.today: date | None = None
+        self.version = 0
+        self._days: dict[date, array] = {}
+        self._totals: dict[date, float] = {}
+        self._sums = dict.fromkeys(windows, 0.0)
+        self._counts = dict.fromkeys(windows, 0)
+        self._tree = QuantileTree()
+
+    def _in_window(self, day: date, window: int, today: date | None) -> bool:
+        return today is not None and 0 <= (today - day).days < window
+
+    def _shift(self, day: date, before: date | None, after: date | None) -> None:
+        """Update the windows for a day, from ending on one date to another."""
+        values = self._days[day]
+        for window in self.windows:
+            sign = self._in_window(day, window, after) - self._in_window(
+                day, window, before
+            )
+            if sign:
+                self._sums[window] += sign * self._totals[day]
+                self._counts[window] += sign * len(values)
+        sign = self._in_window(day, self.longest, after) - self._in_window(
+            day, self.longest, before
+        )
+        if sign:
+            self._tree.add(values, sign)
+
+    def add_day(self, day: date, values: array) -> None:
+        """Add the prices of a delivery day, replacing earlier ones."""
+        if not values:
+            return
+        if self.today is not None and (self.today - day).days >= self.longest:
+            return
+        if day in self._days:
+            self._shift(day, self.today, None)
+        self._days[day] = values
+        self._totals[day] = sum(values)
+        self._shift(day, None, self.today)
+        self.version += 1
+
+    def advance(self, today: date) -> None:
+        """Move the windows to end with a new date."""
+        if today == self.today:
+            return
+        for day in list(self._days):
+            self._shift(day, self.today, today)
+            if (today - day).days >= self.longest:
+                del self._days[day]
+                del self._totals[day]
+        self.today = today
+        self.version += 1
+
+    def average(self, window: int) -> float | None:
+        """Return the average price of the last days of a window."""
+        if not self._counts[window]:
+            return None
+        return self._sums[window] / self._counts[window]
+
+    def days(self, window: int) -> int:
+        """Return how many days of a window are known."""
+        return sum(self._in_window(day, window, self.today) for day in self._days)
+
+    def day_change(self) -> float | None:
+        """Return how much today's average is above yesterday's."""
+        if self.today is None:
+            return None
+        yesterday = self.today - timedelta(days=1)
+        if self.today not in self._days or yesterday not in self._days:
+            return None
+        return self._totals[self.today] / len(self._days[self.today]) - (
+            self._totals[yesterday] / len(self._days[yesterday])
+        )
+
+    def quantile(self, q: float) -> float | None:
+        """Return a percentile of the prices of the longest window."""
+        return self._tree.quantile(q)
@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any
 
 from homeassistant.components.sensor import (
     EntityCategory,
@@ -14,110 +14,102 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
+from homeassistant.const import PERCENTAGE, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.util import dt as dt_util, slugify
 
 from . import DAMConfigEntry
-from .const import LOGGER
+from .const import DEFAULT_SERIES, LOGGER, kiev_tz
 from .coordinator import DAMDataUpdateCoordinator
-from .entity import DAMBaseEntity
+from .battery import BatteryAction, BatteryPlan
+from .entity import DAMBaseEntity, DAMEntityDescription
+from .levels import PriceLevel
+from .rolling import QUANTILES, WINDOWS
+from .timeline import PriceTimeline
+from .windows import PriceWindow
 
 PARALLEL_UPDATES = 0
 
 
-def validate_prices(
-    func: Callable[
-        [DAMPriceSensor],  tuple[float | None, float, float | None]
-    ],
-    entity: DAMPriceSensor,
-    index: int,
-) -> float | None:
-    """Validate and return."""
-    if (result := func(entity)[index]) is not None:
-        return result
-    return None
-
-def get_household_price(
-    entity: DAMPriceSensor,
-) -> float | None:
-    rate = entity.coordinator.get_current_zone_rate()
-    price = entity.coordinator.config_entry.data.get("price")
-
-    if price is not None:
-        return price * rate
-
-    return None
-
-def get_household_selling_price(
-    entity: DAMPriceSensor,
-) -> float | None:
-    rate = entity.coordinator.get_current_zone_rate()
-    price = entity.coordinator.config_entry.data.get("price")
-    rdn_price = get_prices(entity)[1]
-
-    if price is not None and rdn_price is not None:
-        # vat = 1.2
-        return min((price * rate) / 1.2, rdn_price) 
-
-    return None
-
-
-def get_prices(
-    entity: DAMPriceSensor,
-) ->  tuple[float | None, float, float | None]:
-    data = entity.coordinator.get_all_price_entries()
-    last_price_entries: float | None = None
-    current_price_entries: float | None = 0
-    next_price_entries: float | None = None
-    current_time = dt_util.now().timestamp()
-    previous_time = current_time - timedelta(hours=1).total_seconds()
-    next_time = current_time + timedelta(hours=1).total_seconds()
-    LOGGER.debug("Price data: %s", data)
-    for entry in data:
-        if entry is not None and entry.contains(current_time):
-            current_price_entries = entry.value
-        if entry is not None and entry.contains(previous_time):
-            last_price_entries = entry.value
-        if entry is not None and entry.contains(next_time):
-            next_price_entries = entry.value
+def slot_attributes(
+    start: datetime | None, end: datetime | None
+) -> dict[str, str] | None:
+    """Return the start and end attributes of a price slot."""
+    if start is None or end is None:
+        return None
 
+    return {"start": start.isoformat(), "end": end.isoformat()}
 
-    LOGGER.debug(
-        "Last price %s, current price %s, next price %s",
-        last_price_entries,
-        current_price_entries,
-        next_price_entries,
+
+def window_start(entity: DAMSensor, window: PriceWindow | None) -> datetime | None:
+    """Return when a price window starts."""
+    if window is None:
+        return None
+
+    timeline = entity.coordinator.get_all_price_entries()
+    return datetime.fromtimestamp(window.start(timeline), kiev_tz)
+
+
+def window_attributes(
+    entity: DAMSensor, window: PriceWindow | None
+) -> dict[str, Any] | None:
+    """Return the end, average and slots of a price window."""
+    if window is None:
+        return None
+
+    attributes = window.as_dict(entity.coordinator.get_all_price_entries(), kiev_tz)
+    del attributes["start"]
+    return attributes
+
+
+def prices_known_until(entity: DAMSensor) -> datetime | None:
+    """Return the end of the last known price slot."""
+    if not (timeline := entity.coordinator.get_all_price_entries()):
+        return None
+
+    return datetime.fromtimestamp(timeline.ends[-1], kiev_tz)
+
+
+def level_attributes(entity: DAMSensor) -> dict[str, Any] | None:
+    """Return the thresholds of the day and the next level change."""
+    state = entity.coordinator.get_price_level()
+    if state.level is None:
+        return None
+
+    return {
+        "cheap_below": state.cheap_below,
+        "expensive_above": state.expensive_above,
+        "next_change": (
+            None
+            if state.next_change is None
+            else datetime.fromtimestamp(state.next_change, kiev_tz).isoformat()
+        ),
+        "next_level": state.next_level,
+    }
+
+
+def get_battery_plan(entity: DAMSensor) -> tuple[PriceTimeline, BatteryPlan]:
+    """Return the plan of the configured battery."""
+    coordinator = entity.coordinator
+    return coordinator.get_battery_plan(
+        coordinator.battery, coordinator.get_battery_soc()
     )
 
-    result = (
-            last_price_entries,
-            current_price_entries,
-            next_price_entries,
-        )
-    LOGGER.debug("Prices: %s", result)
-    return result
 
+def battery_action(entity: DAMSensor) -> str | None:
+    """Return what the battery should do in the current slot."""
+    horizon, plan = get_battery_plan(entity)
+    if not plan.actions or not horizon.starts[0] <= dt_util.utcnow().timestamp():
+        return None
 
-def get_min_max_price(
-    entity: DAMPriceSensor,
-    func: Callable[[float, float], float],
-) -> tuple[float, datetime, datetime]:
-    """Get the lowest price from the data."""
-    data = entity.coordinator.get_data_current_day()
-    price_data = data
-    price: float = price_data[0].value
-    start: float = price_data[0].start
-    end: float = price_data[0].end
-    for entry in price_data:
-        _price = entry.value
+    return plan.actions[0].value
 
-        if _price == func(price, _price):
-            price = _price
-            start = entry.start
-            end = entry.end
 
-    return (price, datetime.fromtimestamp(start).astimezone(ZoneInfo("Europe/Kiev")), datetime.fromtimestamp(end).astimezone(ZoneInfo("Europe/Kiev")))
+def battery_attributes(entity: DAMSensor) -> dict[str, Any]:
+    """Return the whole battery plan."""
+    horizon, plan = get_battery_plan(entity)
+    return plan.as_dict(horizon, kiev_tz)
 
 
 # def get_blockprices(
@@ -147,14 +139,20 @@ def get_min_max_price(
 
 
 @dataclass(frozen=True, kw_only=True)
-class DAMDefaultSensorEntityDescription(SensorEntityDescription):
+class DAMSensorEntityDescription(SensorEntityDescription, DAMEntityDescription):
+    """Describes  sensor entity."""
+
+
+@dataclass(frozen=True, kw_only=True)
+class DAMDefaultSensorEntityDescription(DAMSensorEntityDescription):
     """Describes  default sensor entity."""
 
     value_fn: Callable[[DAMSensor], str | float | datetime | None]
+    extra_fn: Callable[[DAMSensor], dict[str, Any] | None] = lambda entity: None
 
 
 @dataclass(frozen=True, kw_only=True)
-class DAMPricesSensorEntityDescription(SensorEntityDescription):
+class DAMPricesSensorEntityDescription(DAMSensorEntityDescription):
     """Describes  prices sensor entity."""
 
     value_fn: Callable[[DAMPriceSensor], float | None]
@@ -174,26 +172,223 @@ DEFAULT_SENSOR_TYPES: tuple[DAMDefaultSensorEntityDescription, ...] = (
     DAMDefaultSensorEntityDescription(
         key="updated_at",
         translation_key="updated_at",
+        depends_on=frozenset({"updated_at"}),
         device_class=SensorDeviceClass.TIMESTAMP,
         value_fn=lambda entity: entity.coordinator.updated_at,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
 )
+# written on every update, enabled by hand when something is slow or stale
+DIAGNOSTIC_SENSOR_TYPES: tuple[DAMDefaultSensorEntityDescription, ...] = (
+    DAMDefaultSensorEntityDescription(
+        key="fetch_latency",
+        translation_key="fetch_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=3,
+        value_fn=lambda entity: entity.coordinator.client.stats.average_latency,
+        extra_fn=lambda entity: {
+            "last": entity.coordinator.client.stats.last_latency,
+            "histogram": entity.coordinator.client.stats.latency.as_dict(),
+        },
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    DAMDefaultSensorEntityDescription(
+        key="fetch_retries",
+        translation_key="fetch_retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda entity: entity.coordinator.client.stats.retries,
+        extra_fn=lambda entity: {
+            "requests": entity.coordinator.client.stats.requests,
+            "failures": entity.coordinator.client.stats.failures,
+            "rejected": entity.coordinator.client.stats.rejected,
+            "last_rejection": entity.coordinator.client.stats.last_rejection,
+        },
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    DAMDefaultSensorEntityDescription(
+        key="cache_hit_rate",
+        translation_key="cache_hit_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        value_fn=lambda entity: entity.coordinator.cache_hit_rate,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    DAMDefaultSensorEntityDescription(
+        key="cached_days",
+        translation_key="cached_days",
+        value_fn=lambda entity: sum(
+            len(series.days) for series in entity.coordinator.series.values()
+        ),
+        extra_fn=lambda entity: {
+            "memory_size": sum(
+                series.memory_size for series in entity.coordinator.series.values()
+            ),
+            "loaded_days": sum(
+                series.store.loaded_days
+                for series in entity.coordinator.series.values()
+            ),
+        },
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    DAMDefaultSensorEntityDescription(
+        key="compute_time",
+        translation_key="compute_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda entity: (
+            None
+            if entity.coordinator.tick_stats.last is None
+            else entity.coordinator.tick_stats.last * 1000
+        ),
+        extra_fn=lambda entity: {
+            "average": (entity.coordinator.tick_stats.average or 0) * 1000,
+            "max": entity.coordinator.tick_stats.max * 1000,
+        },
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    DAMDefaultSensorEntityDescription(
+        key="next_fetch",
+        translation_key="next_fetch",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda entity: entity.coordinator.next_fetch,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    DAMDefaultSensorEntityDescription(
+        key="next_refresh",
+        translation_key="next_refresh",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda entity: entity.coordinator.next_refresh,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+)
+FORECAST_SENSOR_TYPES: tuple[DAMDefaultSensorEntityDescription, ...] = (
+    DAMDefaultSensorEntityDescription(
+        key="price_forecast",
+        translation_key="price_forecast",
+        depends_on=frozenset({"forecast"}),
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda entity: prices_known_until(entity),
+        extra_fn=lambda entity: entity.coordinator.get_forecast(),
+    ),
+)
+CHEAPEST_SENSOR_TYPES: tuple[DAMDefaultSensorEntityDescription, ...] = (
+    DAMDefaultSensorEntityDescription(
+        key="cheapest_window",
+        translation_key="cheapest_window",
+        depends_on=frozenset({"cheapest"}),
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda entity: window_start(
+            entity, entity.coordinator.get_cheapest()[0]
+        ),
+        extra_fn=lambda entity: window_attributes(
+            entity, entity.coordinator.get_cheapest()[0]
+        ),
+        entity_registry_enabled_default=False,
+    ),
+    DAMDefaultSensorEntityDescription(
+        key="cheapest_slots",
+        translation_key="cheapest_slots",
+        depends_on=frozenset({"cheapest"}),
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda entity: window_start(
+            entity, entity.coordinator.get_cheapest()[1]
+        ),
+        extra_fn=lambda entity: window_attributes(
+            entity, entity.coordinator.get_cheapest()[1]
+        ),
+        entity_registry_enabled_default=False,
+    ),
+)
+BATTERY_SENSOR_TYPES: tuple[DAMDefaultSensorEntityDescription, ...] = (
+    DAMDefaultSensorEntityDescription(
+        key="battery_action",
+        translation_key="battery_action",
+        depends_on=frozenset({"battery"}),
+        device_class=SensorDeviceClass.ENUM,
+        options=[action.value for action in BatteryAction],
+        value_fn=lambda entity: battery_action(entity),
+        extra_fn=lambda entity: battery_attributes(entity),
+    ),
+)
+LEVEL_SENSOR_TYPES: tuple[DAMDefaultSensorEntityDescription, ...] = (
+    DAMDefaultSensorEntityDescription(
+        key="price_level",
+        translation_key="price_level",
+        depends_on=frozenset({"level"}),
+        device_class=SensorDeviceClass.ENUM,
+        options=[level.value for level in PriceLevel],
+        value_fn=lambda entity: entity.coordinator.get_price_level().level,
+        extra_fn=lambda entity: level_attributes(entity),
+    ),
+)
+# aggregates of the last days, kept up to date as days arrive and leave
+ROLLING_SENSOR_TYPES: tuple[DAMDefaultSensorEntityDescription, ...] = (
+    *(
+        DAMDefaultSensorEntityDescription(
+            key=f"average_{window}_days",
+            translation_key=f"average_{window}_days",
+            depends_on=frozenset({"rolling"}),
+            native_unit_of_measurement="UAH/kWh",
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+            value_fn=lambda entity, window=window: (
+                entity.coordinator.get_rolling().average(window)
+            ),
+            extra_fn=lambda entity, window=window: {
+                "days": entity.coordinator.get_rolling().days(window)
+            },
+            entity_registry_enabled_default=False,
+        )
+        for window in WINDOWS
+    ),
+    DAMDefaultSensorEntityDescription(
+        key="day_over_day_change",
+        translation_key="day_over_day_change",
+        depends_on=frozenset({"rolling"}),
+        native_unit_of_measurement="UAH/kWh",
+        suggested_display_precision=2,
+        value_fn=lambda entity: entity.coordinator.get_rolling().day_change(),
+        entity_registry_enabled_default=False,
+    ),
+    *(
+        DAMDefaultSensorEntityDescription(
+            key=f"price_p{round(quantile * 100)}",
+            translation_key=f"price_p{round(quantile * 100)}",
+            depends_on=frozenset({"rolling"}),
+            native_unit_of_measurement="UAH/kWh",
+            suggested_display_precision=2,
+            value_fn=lambda entity, quantile=quantile: (
+                entity.coordinator.get_rolling().quantile(quantile)
+            ),
+            entity_registry_enabled_default=False,
+        )
+        for quantile in QUANTILES
+    ),
+)
 PRICES_SENSOR_TYPES: tuple[DAMPricesSensorEntityDescription, ...] = (
     DAMPricesSensorEntityDescription(
         key="current_price",
         translation_key="current_price",
-        value_fn=lambda entity: validate_prices(get_prices, entity, 1),
-        extra_fn=lambda entity: {
-            "today_prices": [x.value for x in entity.coordinator.get_data_current_day()],
-        },
+        depends_on=frozenset({"current_price"}),
+        value_fn=lambda entity: entity.snapshot.current_price,
+        extra_fn=lambda entity: None,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
     ),
     DAMPricesSensorEntityDescription(
         key="current_household_price",
         translation_key="current_household_price",
-        value_fn=lambda entity: get_household_price(entity),
+        depends_on=frozenset({"household_price"}),
+        value_fn=lambda entity: entity.snapshot.household_price,
         extra_fn=lambda entity: None,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
@@ -202,7 +397,8 @@ PRICES_SENSOR_TYPES: tuple[DAMPricesSensorEntityDescription, ...] = (
     DAMPricesSensorEntityDescription(
         key="current_household_selling_price",
         translation_key="current_household_selling_price",
-        value_fn=lambda entity: get_household_selling_price(entity),
+        depends_on=frozenset({"household_selling_price"}),
+        value_fn=lambda entity: entity.snapshot.household_selling_price,
         extra_fn=lambda entity: None,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
@@ -211,49 +407,63 @@ PRICES_SENSOR_TYPES: tuple[DAMPricesSensorEntityDescription, ...] = (
     DAMPricesSensorEntityDescription(
         key="last_price",
         translation_key="last_price",
-        value_fn=lambda entity: validate_prices(get_prices, entity, 0),
+        depends_on=frozenset({"last_price"}),
+        value_fn=lambda entity: entity.snapshot.last_price,
         extra_fn=lambda entity: None,
         suggested_display_precision=2,
     ),
     DAMPricesSensorEntityDescription(
         key="next_price",
         translation_key="next_price",
-        value_fn=lambda entity: validate_prices(get_prices, entity, 2),
+        depends_on=frozenset({"next_price"}),
+        value_fn=lambda entity: entity.snapshot.next_price,
         extra_fn=lambda entity: None,
         suggested_display_precision=2,
     ),
     DAMPricesSensorEntityDescription(
         key="lowest_price",
         translation_key="lowest_price",
-        value_fn=lambda entity: get_min_max_price(entity, min)[0],
-        extra_fn=lambda entity: {
-            "start": get_min_max_price(entity, min)[1].isoformat(),
-            "end": get_min_max_price(entity, min)[2].isoformat(),
-        },
+        depends_on=frozenset({"lowest_price", "lowest_start", "lowest_end"}),
+        value_fn=lambda entity: entity.snapshot.lowest_price,
+        extra_fn=lambda entity: slot_attributes(
+            entity.snapshot.lowest_start,
+            entity.snapshot.lowest_end,
+        ),
         suggested_display_precision=2,
     ),
     DAMPricesSensorEntityDescription(
         key="highest_price",
         translation_key="highest_price",
-        value_fn=lambda entity: get_min_max_price(entity, max)[0],
-        extra_fn=lambda entity: {
-            "start": get_min_max_price(entity, max)[1].isoformat(),
-            "end": get_min_max_price(entity, max)[2].isoformat(),
-        },
+        depends_on=frozenset({"highest_price", "highest_start", "highest_end"}),
+        value_fn=lambda entity: entity.snapshot.highest_price,
+        extra_fn=lambda entity: slot_attributes(
+            entity.snapshot.highest_start,
+            entity.snapshot.highest_end,
+        ),
         suggested_display_precision=2,
     ),
 )
 
-DAILY_AVERAGE_PRICES_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+DAILY_AVERAGE_PRICES_SENSOR_TYPES: tuple[DAMSensorEntityDescription, ...] = (
+    DAMSensorEntityDescription(
         key="daily_average",
         translation_key="daily_average",
+        depends_on=frozenset({"daily_average"}),
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
         entity_registry_enabled_default=False,
     ),
 )
 
+# sensors of the extra market and zone series, household prices only apply
+# to the main one
+SERIES_PRICES_SENSOR_TYPES: tuple[DAMPricesSensorEntityDescription, ...] = tuple(
+    replace(description, translation_key=f"series_{description.translation_key}")
+    for description in PRICES_SENSOR_TYPES
+    if description.key
+    in ("current_price", "last_price", "next_price", "lowest_price", "highest_price")
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -271,8 +481,20 @@ async def async_setup_entry(
     LOGGER.debug("Setting up base sensors",)
     entities.extend(
         DAMSensor(coordinator, description)
-        for description in DEFAULT_SENSOR_TYPES
+        for description in (
+            *DEFAULT_SENSOR_TYPES,
+            *DIAGNOSTIC_SENSOR_TYPES,
+            *FORECAST_SENSOR_TYPES,
+            *CHEAPEST_SENSOR_TYPES,
+            *LEVEL_SENSOR_TYPES,
+            *ROLLING_SENSOR_TYPES,
+        )
     )
+    if coordinator.battery:
+        entities.extend(
+            DAMSensor(coordinator, description)
+            for description in BATTERY_SENSOR_TYPES
+        )
     LOGGER.debug(
         "Setting up price sensors for with currency"
     )
@@ -284,6 +506,14 @@ async def async_setup_entry(
         DAMDailyAveragePriceSensor(coordinator, description)
         for description in DAILY_AVERAGE_PRICES_SENSOR_TYPES
     )
+    for series in coordinator.series:
+        if series == DEFAULT_SERIES:
+            continue
+        LOGGER.debug("Setting up price sensors for %s", series)
+        entities.extend(
+            DAMPriceSensor(coordinator, description, series)
+            for description in SERIES_PRICES_SENSOR_TYPES
+        )
     async_add_entities(entities)
 
 
@@ -291,12 +521,28 @@ class DAMSensor(DAMBaseEntity, SensorEntity):
     """Representation of a  sensor."""
 
     entity_description: DAMDefaultSensorEntityDescription
+    # price lists and plans are too big to be stored on every state change
+    _unrecorded_attributes = frozenset(
+        {"today", "tomorrow", "slots", "plan", "histogram"}
+    )
+
+    @property
+    def available(self) -> bool:
+        """Keep diagnostic sensors available while prices are missing."""
+        if self.entity_description.entity_category is EntityCategory.DIAGNOSTIC:
+            return True
+        return super().available
 
     @property
     def native_value(self) -> str | float | datetime | None:
         """Return value of sensor."""
         return self.entity_description.value_fn(self)
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the extra state attributes."""
+        return self.entity_description.extra_fn(self)
+
 
 class DAMPriceSensor(DAMBaseEntity, SensorEntity):
     """Representation of price sensor."""
@@ -306,10 +552,11 @@ class DAMPriceSensor(DAMBaseEntity, SensorEntity):
     def __init__(
         self,
         coordinator: DAMDataUpdateCoordinator,
-        entity_description: DAMPricesSensorEntityDescription
+        entity_description: DAMPricesSensorEntityDescription,
+        series: str | None = None,
     ) -> None:
         """Initiate sensor."""
-        super().__init__(coordinator, entity_description)
+        super().__init__(coordinator, entity_description, series)
         self._attr_native_unit_of_measurement = "UAH/kWh"
 
     @property
@@ -327,12 +574,12 @@ class DAMPriceSensor(DAMBaseEntity, SensorEntity):
 class DAMDailyAveragePriceSensor(DAMBaseEntity, SensorEntity):
     """Representation of a  daily average price sensor."""
 
-    entity_description: SensorEntityDescription
+    entity_description: DAMSensorEntityDescription
 
     def __init__(
         self,
         coordinator: DAMDataUpdateCoordinator,
-        entity_description: SensorEntityDescription,
+        entity_description: DAMSensorEntityDescription,
     ) -> None:
         """Initiate  sensor."""
         super().__init__(coordinator, entity_description)
@@ -341,7 +588,4 @@ class DAMDailyAveragePriceSensor(DAMBaseEntity, SensorEntity):
     @property
     def native_value(self) -> float | None:
         """Return value of sensor."""
-        data = self.coordinator.get_data_current_day()
-        values = [x.value for x in data]
-        ### avg value
-        return sum(values) / len(values) if values else None
+        return self.snapshot.daily_average
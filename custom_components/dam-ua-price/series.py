@@ -0,0 +1,112 @@
+"""Price series of one OREE market and price zone."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .api import OREEClient
+from .const import LOGGER, kiev_tz
+from .statistics import PriceStatistics
+from .storage import STORAGE_KEY, DAMPriceStore
+from .timeline import PriceTimeline
+
+
+def parse_series(key: str) -> tuple[str, int]:
+    """Return the market and zone of a series key like DAM_2."""
+    market, zone = key.split("_")
+    return market, int(zone)
+
+
+class PriceSeries:
+    """Delivery days of one market and zone, in memory and on disk."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: OREEClient,
+        key: str,
+        retention_days: int,
+    ) -> None:
+        """Initialize the series."""
+        self.key = key
+        self.market, self.zone = parse_series(key)
+        self.client = client
+        self.store = DAMPriceStore(hass, f"{STORAGE_KEY}.{key}")
+        self.statistics = PriceStatistics(hass, key)
+        self.retention_days = retention_days
+        self.days: dict[date, PriceTimeline] = {}
+        self.data_version = 0
+        self.updated_at: datetime | None = None
+        self._timeline: PriceTimeline | None = None
+
+    def set_day(self, day: date, prices: PriceTimeline) -> None:
+        """Keep the prices of a delivery day in memory."""
+        self.days[day] = prices
+        self._timeline = None
+        self.data_version += 1
+
+    def evict_days(self, today: date) -> None:
+        """Drop days older than the retention window, they stay on disk."""
+        oldest = today - timedelta(days=self.retention_days)
+
+        for day in [day for day in self.days if day < oldest]:
+            LOGGER.debug("Evicting %s prices of %s", self.key, day)
+            del self.days[day]
+            self._timeline = None
+            self.data_version += 1
+
+    @property
+    def timeline(self) -> PriceTimeline:
+        """Return all days in memory as one timeline."""
+        if self._timeline is None:
+            self._timeline = PriceTimeline.concat(
+                self.days[day] for day in sorted(self.days)
+            )
+
+        return self._timeline
+
+    @property
+    def memory_size(self) -> int:
+        """Return the bytes taken by the price arrays in memory."""
+        timelines = [*self.days.values()]
+        if self._timeline is not None:
+            timelines.append(self._timeline)
+        return sum(timeline.nbytes for timeline in timelines)
+
+    def get_day(self, day: date) -> PriceTimeline:
+        """Return the prices of a delivery day, empty if unknown."""
+        return self.days.get(day) or PriceTimeline()
+
+    async def async_fetch_day(
+        self, day: date, retry: int | None = None
+    ) -> PriceTimeline | None:
+        """Fetch a delivery day from OREE into the disk cache."""
+        priceRanges = await self.client.async_get_prices(
+            day, self.market, self.zone, retries=retry
+        )
+        if priceRanges is None:
+            return None
+
+        await self.store.async_put_day(
+            day, dt_util.utcnow(), priceRanges.values.tolist()
+        )
+        return priceRanges
+
+    async def async_load_cache(self, today: date) -> None:
+        """Warm start from the days cached on disk."""
+        cached = await self.store.async_load_days(
+            today + timedelta(days=offset)
+            for offset in range(-self.retention_days, 2)
+        )
+
+        for day, (fetched_at, values) in sorted(cached.items()):
+            if (priceRanges := PriceTimeline.for_day(day, values, kiev_tz)) is None:
+                continue
+            self.set_day(day, priceRanges)
+            if fetched_at and (not self.updated_at or fetched_at > self.updated_at):
+                self.updated_at = fetched_at
+
+        LOGGER.debug("Loaded %s %s days from cache", len(cached), self.key)
@@ -0,0 +1,265 @@
+"""Services for the integration."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.selector import ConfigEntrySelector
+from homeassistant.util import dt as dt_util
+
+from .battery import BatteryConfig
+from .const import DEFAULT_BATTERY_EFFICIENCY, DOMAIN, SERIES, kiev_tz
+from .windows import cheapest_slots, cheapest_window
+
+if TYPE_CHECKING:
+    from . import DAMConfigEntry
+    from .coordinator import DAMDataUpdateCoordinator
+    from .series import PriceSeries
+
+ATTR_CONFIG_ENTRY = "config_entry"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_SERIES = "series"
+ATTR_DURATION = "duration"
+ATTR_EARLIEST_START = "earliest_start"
+ATTR_DEADLINE = "deadline"
+ATTR_CAPACITY = "capacity"
+ATTR_CHARGE_POWER = "charge_power"
+ATTR_DISCHARGE_POWER = "discharge_power"
+ATTR_EFFICIENCY = "efficiency"
+ATTR_SOC = "soc"
+
+# the Ukrainian DAM started trading on this day
+FIRST_DAM_DAY = date(2019, 7, 1)
+# days one backfill call may queue, each one a request to OREE
+MAX_BACKFILL_DAYS = 366
+
+SERVICE_BACKFILL = "backfill"
+SERVICE_FIND_CHEAPEST_HOURS = "find_cheapest_hours"
+SERVICE_PLAN_BATTERY = "plan_battery"
+SERVICE_GET_PRICES = "get_prices"
+
+SERVICE_BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): ConfigEntrySelector(
+            {
+                "integration": DOMAIN,
+            }
+        ),
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_SERIES): vol.In(SERIES),
+    }
+)
+
+
+SERVICE_FIND_CHEAPEST_HOURS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): ConfigEntrySelector(
+            {
+                "integration": DOMAIN,
+            }
+        ),
+        vol.Required(ATTR_DURATION): cv.positive_time_period,
+        vol.Optional(ATTR_EARLIEST_START): cv.datetime,
+        vol.Optional(ATTR_DEADLINE): cv.datetime,
+        vol.Optional(ATTR_SERIES): vol.In(SERIES),
+    }
+)
+
+
+SERVICE_PLAN_BATTERY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): ConfigEntrySelector(
+            {
+                "integration": DOMAIN,
+            }
+        ),
+        vol.Required(ATTR_CAPACITY): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+        vol.Required(ATTR_CHARGE_POWER): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Required(ATTR_DISCHARGE_POWER): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_EFFICIENCY, default=DEFAULT_BATTERY_EFFICIENCY): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_SOC, default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_SERIES): vol.In(SERIES),
+    }
+)
+
+
+SERVICE_GET_PRICES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): ConfigEntrySelector(
+            {
+                "integration": DOMAIN,
+            }
+        ),
+        vol.Optional(ATTR_SERIES): vol.In(SERIES),
+    }
+)
+
+
+def get_config_entry(hass: HomeAssistant, entry_id: str) -> DAMConfigEntry:
+    """Return config entry."""
+    if not (entry := hass.config_entries.async_get_entry(entry_id)):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_found",
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+        )
+    return entry
+
+
+def get_series(
+    coordinator: DAMDataUpdateCoordinator, series: str | None
+) -> PriceSeries:
+    """Return a series of the coordinator, the main one by default."""
+    if series and series not in coordinator.series:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="series_not_configured",
+            translation_placeholders={"series": series},
+        )
+    return coordinator.get_series(series)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up services for the integration."""
+
+    async def backfill(call: ServiceCall) -> ServiceResponse:
+        """Fetch the delivery days of a date range into the cache."""
+        entry = get_config_entry(hass, call.data[ATTR_CONFIG_ENTRY])
+        tomorrow = dt_util.utcnow().astimezone(kiev_tz).date() + timedelta(days=1)
+        start = call.data[ATTR_START_DATE]
+        end = call.data.get(ATTR_END_DATE) or start
+
+        if start > end or end > tomorrow:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="invalid_date_range",
+                translation_placeholders={
+                    "start": start.isoformat(),
+                    "end": end.isoformat(),
+                },
+            )
+        if start < FIRST_DAM_DAY:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="start_before_market",
+                translation_placeholders={
+                    "start": start.isoformat(),
+                    "first_day": FIRST_DAM_DAY.isoformat(),
+                },
+            )
+        if (end - start).days >= MAX_BACKFILL_DAYS:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="date_range_too_long",
+                translation_placeholders={
+                    "start": start.isoformat(),
+                    "end": end.isoformat(),
+                    "max_days": str(MAX_BACKFILL_DAYS),
+                },
+            )
+
+        coordinator = entry.runtime_data
+        return await coordinator.source.async_backfill(
+            start, end, get_series(coordinator, call.data.get(ATTR_SERIES))
+        )
+
+    async def get_prices(call: ServiceCall) -> ServiceResponse:
+        """Return the prices of today and tomorrow."""
+        entry = get_config_entry(hass, call.data[ATTR_CONFIG_ENTRY])
+        coordinator = entry.runtime_data
+        series = get_series(coordinator, call.data.get(ATTR_SERIES))
+        return coordinator.get_forecast(series.key)
+
+    async def find_cheapest_hours(call: ServiceCall) -> ServiceResponse:
+        """Find the cheapest window and slots over the known prices."""
+        entry = get_config_entry(hass, call.data[ATTR_CONFIG_ENTRY])
+        coordinator = entry.runtime_data
+        series = get_series(coordinator, call.data.get(ATTR_SERIES))
+        timeline = series.timeline
+
+        duration = call.data[ATTR_DURATION].total_seconds()
+        earliest = dt_util.as_utc(
+            call.data.get(ATTR_EARLIEST_START) or dt_util.utcnow()
+        ).timestamp()
+        # a slot in progress still counts
+        if (index := timeline.index_at(earliest)) is not None:
+            earliest = timeline.starts[index]
+        deadline = None
+        if ATTR_DEADLINE in call.data:
+            deadline = dt_util.as_utc(call.data[ATTR_DEADLINE]).timestamp()
+
+        window = cheapest_window(timeline, duration, earliest, deadline)
+        slots = cheapest_slots(timeline, duration, earliest, deadline)
+
+        return {
+            "window": window.as_dict(timeline, kiev_tz) if window else None,
+            "slots": slots.as_dict(timeline, kiev_tz) if slots else None,
+        }
+
+    async def plan_battery(call: ServiceCall) -> ServiceResponse:
+        """Plan charging and discharging of a battery over the known prices."""
+        entry = get_config_entry(hass, call.data[ATTR_CONFIG_ENTRY])
+        coordinator = entry.runtime_data
+        series = get_series(coordinator, call.data.get(ATTR_SERIES))
+        battery = BatteryConfig(
+            capacity=call.data[ATTR_CAPACITY],
+            charge_power=call.data[ATTR_CHARGE_POWER],
+            discharge_power=call.data[ATTR_DISCHARGE_POWER],
+            efficiency=call.data[ATTR_EFFICIENCY] / 100,
+        )
+
+        horizon, plan = coordinator.get_battery_plan(
+            battery, min(call.data[ATTR_SOC], battery.capacity), series.key
+        )
+        return plan.as_dict(horizon, kiev_tz)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKFILL,
+        backfill,
+        schema=SERVICE_BACKFILL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_PRICES,
+        get_prices,
+        schema=SERVICE_GET_PRICES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_CHEAPEST_HOURS,
+        find_cheapest_hours,
+        schema=SERVICE_FIND_CHEAPEST_HOURS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PLAN_BATTERY,
+        plan_battery,
+        schema=SERVICE_PLAN_BATTERY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
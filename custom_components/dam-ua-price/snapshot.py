@@ -0,0 +1,105 @@
+"""Derived price values shared by all sensors."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+
+from .timeline import PriceTimeline
+
+# household prices include VAT, the DAM price does not
+VAT = 1.2
+
+
+def household_prices(
+    values: array, rates: array, base_price: float
+) -> tuple[array, array]:
+    """Return the household buy and sell price of every slot.
+
+    Buying costs the base price times the zone rate, selling earns the buy
+    price without VAT but never more than the market price.
+    """
+    net_price = base_price / VAT
+    buy = array("d", [base_price * rate for rate in rates])
+    sell = array("d", map(min, [net_price * rate for rate in rates], values))
+    return buy, sell
+
+
+@dataclass(frozen=True, slots=True)
+class PriceSnapshot:
+    """Everything the sensors show, computed once per slot and data version."""
+
+    last_price: float | None = None
+    current_price: float | None = None
+    next_price: float | None = None
+    lowest_price: float | None = None
+    lowest_start: datetime | None = None
+    lowest_end: datetime | None = None
+    highest_price: float | None = None
+    highest_start: datetime | None = None
+    highest_end: datetime | None = None
+    daily_average: float | None = None
+    household_price: float | None = None
+    household_selling_price: float | None = None
+
+    @classmethod
+    def build(
+        cls,
+        timeline: PriceTimeline,
+        today: PriceTimeline,
+        index: int | None,
+        zone_rate: float,
+        base_price: float | None,
+        tz: tzinfo,
+    ) -> PriceSnapshot:
+        """Compute a snapshot for the slot at index of the timeline."""
+        last_price: float | None = None
+        current_price: float | None = None
+        next_price: float | None = None
+
+        if index is not None:
+            current_price = timeline.values[index]
+            # neighbours only count when there is no gap to the current slot
+            if index > 0 and timeline.ends[index - 1] == timeline.starts[index]:
+                last_price = timeline.values[index - 1]
+            if (
+                index + 1 < len(timeline)
+                and timeline.starts[index + 1] == timeline.ends[index]
+            ):
+                next_price = timeline.values[index + 1]
+
+        household_price: float | None = None
+        household_selling_price: float | None = None
+        if base_price is not None:
+            household_price = base_price * zone_rate
+            if current_price is not None:
+                household_selling_price = min(household_price / VAT, current_price)
+
+        if not today:
+            return cls(
+                last_price=last_price,
+                current_price=current_price,
+                next_price=next_price,
+                household_price=household_price,
+                household_selling_price=household_selling_price,
+            )
+
+        values = today.values
+        lowest = min(range(len(values)), key=values.__getitem__)
+        highest = max(range(len(values)), key=values.__getitem__)
+
+        return cls(
+            last_price=last_price,
+            current_price=current_price,
+            next_price=next_price,
+            lowest_price=values[lowest],
+            lowest_start=datetime.fromtimestamp(today.starts[lowest], tz),
+            lowest_end=datetime.fromtimestamp(today.ends[lowest], tz),
+            highest_price=values[highest],
+            highest_start=datetime.fromtimestamp(today.starts[highest], tz),
+            highest_end=datetime.fromtimestamp(today.ends[highest], tz),
+            daily_average=sum(values) / len(values),
+            household_price=household_price,
+            household_selling_price=household_selling_price,
+        )
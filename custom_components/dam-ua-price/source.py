@@ -0,0 +1,450 @@
+"""Prices shared by all config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta
+from random import random
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .api import DEFAULT_BASE_URL, OREEClient, OREEError
+from .const import DEFAULT_SERIES, DOMAIN, LOGGER, kiev_tz
+from .crossings import cheapest_hours_starts, threshold_crossings
+from .rolling import RollingPrices
+from .series import PriceSeries
+from .timeline import PriceTimeline
+
+if TYPE_CHECKING:
+    from .coordinator import DAMDataUpdateCoordinator
+
+FETCH_RETRY_INTERVAL = timedelta(minutes=15)
+# prices of the next day are usually published in the early afternoon
+PUBLICATION_TIME = time(13, 0)
+PUBLICATION_POLL_INITIAL = timedelta(minutes=5)
+PUBLICATION_POLL_MAX = timedelta(hours=1)
+BACKFILL_CONCURRENCY = 4
+
+DATA_SOURCE = f"{DOMAIN}.source"
+
+
+class DAMPriceSource:
+    """Price series, OREE client and fetch schedule of all config entries.
+
+    Every config entry has its own coordinator for the values that depend
+    on its meter and tariff, the prices are fetched, kept and aggregated
+    once here. Coordinators attach on setup and detach on unload, the
+    source stops when the last one is gone.
+    """
+
+    updated_at: datetime | None = None
+    publication_latency: timedelta | None = None
+    publication_polls: int = 0
+    # the day publication_polls count for
+    publication_day: date | None = None
+
+    def __init__(self, hass: HomeAssistant, base_url: str = DEFAULT_BASE_URL) -> None:
+        """Initialize the source, base_url points it at another OREE."""
+        self.hass = hass
+        self.client = OREEClient(async_get_clientsession(hass), base_url)
+        # one session and one schedule for all series
+        self.series: dict[str, PriceSeries] = {}
+        self.retention_days = 0
+        # the series and retention each attached coordinator asked for
+        self.coordinators: dict[
+            DAMDataUpdateCoordinator, tuple[tuple[str, ...], int]
+        ] = {}
+        self.unsubSyncPrices: Callable[[], None] | None = None
+        self.next_fetch: datetime | None = None
+        self._started = False
+        # set when the last coordinator detached, a fetch running then ends
+        # without scheduling another
+        self._stopped = False
+        self._fetch_lock = asyncio.Lock()
+        self._fetch_task: asyncio.Task | None = None
+        self._backfill_lock = asyncio.Lock()
+        self._loaded: set[str] = set()
+        self._crossings: dict[tuple[str, str, float], tuple[int, list[float]]] = {}
+        # aggregates of the main series over the last days
+        self.rolling = RollingPrices()
+
+        self.updateMinute = int(random() * 59)
+        self.updateSecond = int(random() * 59)
+
+    @classmethod
+    def async_get(cls, hass: HomeAssistant) -> DAMPriceSource:
+        """Return the source of the running instance, created on first use."""
+        if (source := hass.data.get(DATA_SOURCE)) is None:
+            source = hass.data[DATA_SOURCE] = cls(hass)
+        return source
+
+    @property
+    def primary(self) -> PriceSeries:
+        """Return the series behind the main price sensors."""
+        return self.series[DEFAULT_SERIES]
+
+    def attach(
+        self,
+        coordinator: DAMDataUpdateCoordinator,
+        series: list[str],
+        retention_days: int,
+    ) -> dict[str, PriceSeries]:
+        """Add a coordinator, return the series it asked for."""
+        keys = tuple(dict.fromkeys((DEFAULT_SERIES, *series)))
+        self.coordinators[coordinator] = (keys, retention_days)
+        self._update_series()
+        return {key: self.series[key] for key in keys}
+
+    def _update_series(self) -> list[PriceSeries]:
+        """Match the series to the attached coordinators, return the dropped.
+
+        Series are created when the first coordinator asks for them and
+        dropped with the last one, all are kept for as many days as the
+        longest retention asks for.
+        """
+        wanted = {key for keys, _ in self.coordinators.values() for key in keys}
+        self.retention_days = max(
+            (retention_days for _, retention_days in self.coordinators.values()),
+            default=0,
+        )
+        dropped = [
+            self.series.pop(key) for key in list(self.series) if key not in wanted
+        ]
+        for series in dropped:
+            self._loaded.discard(series.key)
+        if dropped:
+            self._crossings = {
+                key: value
+                for key, value in self._crossings.items()
+                if key[0] in self.series
+            }
+        for key in sorted(wanted - self.series.keys()):
+            self.series[key] = PriceSeries(
+                self.hass, self.client, key, self.retention_days
+            )
+        for price_series in self.series.values():
+            price_series.retention_days = self.retention_days
+        return dropped
+
+    async def async_detach(self, coordinator: DAMDataUpdateCoordinator) -> None:
+        """Remove a coordinator, drop what only it used, stop with the last one."""
+        if self.coordinators.pop(coordinator, None) is None:
+            return
+        if self.coordinators:
+            # series no entry shows any more are neither fetched nor kept
+            for series in self._update_series():
+                await series.store.async_flush()
+            return
+
+        self._stopped = True
+        # entries set up from now on get a new source
+        if self.hass.data.get(DATA_SOURCE) is self:
+            del self.hass.data[DATA_SOURCE]
+        if self.unsubSyncPrices:
+            self.unsubSyncPrices()
+            self.unsubSyncPrices = None
+        if self._fetch_task:
+            self._fetch_task.cancel()
+        # the next setup starts a new source on the same stores, so the
+        # cancelled fetch must be over before the last write
+        async with self._fetch_lock:
+            for series in self.series.values():
+                await series.store.async_flush()
+
+    async def async_start(self) -> None:
+        """Start the fetch schedule, or fetch the series added since."""
+        now = dt_util.utcnow()
+        if not self._started:
+            self._started = True
+            await self.async_load_rolling(now)
+            # days cached while the recorder was not running
+            for series in self.series.values():
+                for day in sorted(series.days):
+                    await series.statistics.async_import(series.days[day])
+        elif all(
+            series.days.get(now.astimezone(kiev_tz).date())
+            for series in self.series.values()
+        ):
+            return
+        await self.fetch_data(now)
+
+    @callback
+    def async_update_changed(self) -> None:
+        """Notify the coordinators of new prices."""
+        for coordinator in self.coordinators:
+            coordinator.async_update_changed()
+
+    def get_publication_start(self, day: date) -> datetime:
+        """Return when polling for the prices of the day after starts.
+
+        Every install starts at its own random minute and second past the
+        expected publication time to spread the load on OREE.
+        """
+        return datetime.combine(day, PUBLICATION_TIME, kiev_tz) + timedelta(
+            minutes=self.updateMinute, seconds=self.updateSecond
+        )
+
+    def get_next_fetch(self, now: datetime) -> datetime:
+        """Compute when prices should be fetched next.
+
+        While tomorrow is missing after its publication time the delay
+        grows exponentially with random jitter, up to an hour.
+        """
+        kiev_now = now.astimezone(kiev_tz)
+        kiev_today = kiev_now.date()
+        kiev_tomorrow = kiev_today + timedelta(days=1)
+
+        if not all(series.days.get(kiev_today) for series in self.series.values()):
+            # do not wait for the next daily run while today is still missing
+            return now + FETCH_RETRY_INTERVAL
+
+        if self.publication_day != kiev_tomorrow:
+            # a day that was never published must not slow down the next one
+            self.publication_day = kiev_tomorrow
+            self.publication_polls = 0
+
+        publication_start = self.get_publication_start(kiev_today)
+        if now < publication_start:
+            return publication_start
+
+        if all(series.days.get(kiev_tomorrow) for series in self.series.values()):
+            self.publication_polls = 0
+            return self.get_publication_start(kiev_tomorrow)
+
+        delay = min(
+            PUBLICATION_POLL_MAX,
+            PUBLICATION_POLL_INITIAL * 2**self.publication_polls,
+        ) * (0.5 + random())
+        self.publication_polls += 1
+        return now + delay
+
+    async def fetch_data(self, now: datetime) -> None:
+        """Fetch the missing days and schedule the next fetch.
+
+        Entries set up together all start the source, the lock makes the
+        later ones find the days already there.
+        """
+        async with self._fetch_lock:
+            if self._stopped:
+                return
+            self._fetch_task = asyncio.current_task()
+            try:
+                await self._async_fetch_data(now)
+            finally:
+                self._fetch_task = None
+
+    async def _async_fetch_data(self, now: datetime) -> None:
+        if self.unsubSyncPrices:
+            self.unsubSyncPrices()
+            self.unsubSyncPrices = None
+
+        kiev_now = now.astimezone(kiev_tz)
+        kiev_today = kiev_now.date()
+        kiev_tomorrow = kiev_today + timedelta(days=1)
+        publication_start = self.get_publication_start(kiev_today)
+        updated_at = self.updated_at
+
+        async def fetch(series: PriceSeries, day: date) -> None:
+            if series.days.get(day):
+                return
+            day_now = datetime.combine(day, kiev_now.timetz())
+            if priceRanges := await self.api_call(day_now, series=series):
+                series.set_day(day, priceRanges)
+                if series is self.primary:
+                    self.rolling.add_day(day, priceRanges.values)
+                await series.statistics.async_import(priceRanges)
+                series.updated_at = now
+                self.updated_at = now
+                if series is self.primary and day == kiev_tomorrow:
+                    self.publication_latency = now - datetime.combine(
+                        kiev_today, PUBLICATION_TIME, kiev_tz
+                    )
+                    LOGGER.debug(
+                        "Prices of %s published %s after %s, %s polls",
+                        day,
+                        self.publication_latency,
+                        PUBLICATION_TIME,
+                        self.publication_polls,
+                    )
+
+        try:
+            await asyncio.gather(
+                *(fetch(series, kiev_today) for series in self.series.values()),
+                *(
+                    fetch(series, kiev_tomorrow)
+                    for series in self.series.values()
+                    if now >= publication_start
+                ),
+            )
+
+            # new prices are pushed on their own, the next fetch is scheduled
+            # whether or not anything arrived
+            if self.updated_at != updated_at:
+                self.async_update_changed()
+        finally:
+            # a failure other than OREE's, such as a store or statistics
+            # error, must not end the schedule, only detaching the last
+            # coordinator does
+            if not self._stopped:
+                self.next_fetch = self.get_next_fetch(now)
+                LOGGER.debug("Next rdn update at %s", self.next_fetch)
+                self.unsubSyncPrices = async_track_point_in_utc_time(
+                    self.hass, self.fetch_data, self.next_fetch
+                )
+
+    async def api_call(
+        self, now: datetime, retry: int = 3, series: PriceSeries | None = None
+    ):
+        """Make api call to retrieve data with retry if failure."""
+        series = series or self.primary
+        try:
+            if priceRanges := await series.async_fetch_day(
+                now.astimezone(kiev_tz).date(), retry
+            ):
+                return priceRanges
+            error: Exception = Exception("No current day data")
+        except OREEError as err:
+            LOGGER.debug("Fetching %s prices failed: %s", series.key, err)
+            error = err
+
+        # other series or tomorrow missing must not take the main sensors down
+        if series is self.primary and now.astimezone(kiev_tz).date() == (
+            dt_util.utcnow().astimezone(kiev_tz).date()
+        ):
+            for coordinator in self.coordinators:
+                coordinator.async_set_update_error(error)
+        return None
+
+    async def async_backfill(
+        self, start: date, end: date, series: PriceSeries | None = None
+    ) -> dict[str, Any]:
+        """Fetch the days of a date range that are not cached yet.
+
+        Months are processed one after another and written to disk when done,
+        so an interrupted backfill continues where it stopped and only one
+        month of history is held in memory. Every day of the range, fetched
+        or cached, is imported into the long-term statistics.
+        """
+        series = series or self.primary
+        semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+        fetched: list[date] = []
+        missing: list[date] = []
+        cached = 0
+
+        async def fetch(day: date) -> None:
+            async with semaphore:
+                try:
+                    priceRanges = await series.async_fetch_day(day)
+                except OREEError as error:
+                    LOGGER.debug("Backfill of %s failed: %s", day, error)
+                    priceRanges = None
+            (fetched if priceRanges else missing).append(day)
+            if priceRanges:
+                if series is self.primary:
+                    self.rolling.add_day(day, priceRanges.values)
+                await series.statistics.async_import(priceRanges, force=True)
+
+        async with self._backfill_lock:
+            month_start = start
+            while month_start <= end:
+                next_month = (
+                    month_start.replace(day=28) + timedelta(days=4)
+                ).replace(day=1)
+                month_end = min(end, next_month - timedelta(days=1))
+                days = [
+                    month_start + timedelta(days=offset)
+                    for offset in range((month_end - month_start).days + 1)
+                ]
+                todo = [
+                    day for day in days if not await series.store.async_has_day(day)
+                ]
+                cached += len(days) - len(todo)
+
+                if series.statistics.enabled:
+                    stored = await series.store.async_load_days(
+                        day for day in days if day not in todo
+                    )
+                    for day, (_, values) in sorted(stored.items()):
+                        if prices := PriceTimeline.for_day(day, values, kiev_tz):
+                            await series.statistics.async_import(prices, force=True)
+
+                await asyncio.gather(*(fetch(day) for day in todo))
+                await series.store.async_flush()
+                series.store.release()
+                LOGGER.debug("Backfilled %s, %s days fetched", month_start, len(todo))
+
+                month_start = next_month
+
+        return {
+            "fetched": len(fetched),
+            "cached": cached,
+            "missing": [day.isoformat() for day in sorted(missing)],
+        }
+
+    async def async_load_rolling(self, now: datetime) -> None:
+        """Fill the rolling aggregates with the recent days of the main series.
+
+        Days older than the retention are read from the disk cache once,
+        from then on the aggregates follow the days as they arrive.
+        """
+        series = self.primary
+        today = now.astimezone(kiev_tz).date()
+        self.rolling.advance(today)
+        for day, prices in series.days.items():
+            self.rolling.add_day(day, prices.values)
+
+        cached = await series.store.async_load_days(
+            day
+            for offset in range(self.rolling.longest)
+            if (day := today - timedelta(days=offset)) not in series.days
+        )
+        for day, (_, values) in cached.items():
+            if prices := PriceTimeline.for_day(day, values, kiev_tz):
+                self.rolling.add_day(day, prices.values)
+        series.store.release()
+        LOGGER.debug("Loaded %s days into the rolling aggregates", len(cached))
+
+    def get_rolling(self) -> RollingPrices:
+        """Return the rolling aggregates, moved on to today."""
+        self.rolling.advance(dt_util.utcnow().astimezone(kiev_tz).date())
+        return self.rolling
+
+    async def async_load_cache(self, now: datetime) -> None:
+        """Warm start from the days cached on disk, once per series."""
+        today = now.astimezone(kiev_tz).date()
+        for series in self.series.values():
+            if series.key in self._loaded:
+                continue
+            self._loaded.add(series.key)
+            await series.async_load_cache(today)
+            if series.updated_at and (
+                not self.updated_at or series.updated_at > self.updated_at
+            ):
+                self.updated_at = series.updated_at
+
+    def get_crossings(
+        self, kind: str, value: float, series: str | None = None
+    ) -> list[float]:
+        """Return when the prices cross a threshold or enter the cheapest hours.
+
+        Kinds are below and above with a price, or cheapest with hours.
+        Triggers of the same kind and value share the list, which is
+        computed once per data version.
+        """
+        price_series = self.series[series] if series else self.primary
+        key = (price_series.key, kind, value)
+        cached = self._crossings.get(key)
+        if cached is None or cached[0] != price_series.data_version:
+            timeline = price_series.timeline
+            if kind == "cheapest":
+                crossings = cheapest_hours_starts(timeline, value, kiev_tz)
+            else:
+                crossings = threshold_crossings(timeline, value, kind == "below")
+            cached = self._crossings[key] = (price_series.data_version, crossings)
+
+        return cached[1]
@@ -0,0 +1,124 @@
+"""Import of delivery day prices into long-term statistics."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER, SERIES
+from .timeline import PriceTimeline
+
+# statistic ids take the domain as source, which must not contain hyphens
+STATISTIC_SOURCE = DOMAIN.replace("-", "_")
+HOUR = 3600
+
+
+def statistic_id(series: str) -> str:
+    """Return the external statistic id of a series like DAM_2."""
+    return f"{STATISTIC_SOURCE}:{series.lower()}"
+
+
+def hourly_statistics(
+    prices: PriceTimeline, after: float | None = None
+) -> list[StatisticData]:
+    """Return the mean, min and max price of every hour of a timeline.
+
+    Long-term statistics are hourly, so quarter hour slots are folded into
+    their hour. Hours starting before after are left out.
+    """
+    result: list[StatisticData] = []
+    hour: float | None = None
+    values: list[float] = []
+
+    def add() -> None:
+        if hour is not None and (after is None or hour >= after):
+            result.append(
+                StatisticData(
+                    start=datetime.fromtimestamp(hour, dt_util.UTC),
+                    mean=sum(values) / len(values),
+                    min=min(values),
+                    max=max(values),
+                )
+            )
+
+    for start, value in zip(prices.starts, prices.values):
+        slot_hour = start - start % HOUR
+        if slot_hour != hour:
+            add()
+            hour = slot_hour
+            values = []
+        values.append(value)
+    add()
+    return result
+
+
+class PriceStatistics:
+    """Hourly prices of a series as external statistics.
+
+    The start of the hour after the last imported one is read from the
+    recorder once and then tracked, so days are imported incrementally and
+    importing a day again is a no-op.
+    """
+
+    def __init__(self, hass: HomeAssistant, series: str) -> None:
+        """Initialize the statistics of a series."""
+        self._hass = hass
+        self.statistic_id = statistic_id(series)
+        self.metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.ARITHMETIC,
+            has_sum=False,
+            name=f"{SERIES.get(series, series)} price",
+            source=STATISTIC_SOURCE,
+            statistic_id=self.statistic_id,
+            unit_class=None,
+            unit_of_measurement="UAH/kWh",
+        )
+        self.imported_until: float | None = None
+        self._loaded = False
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether the recorder is there to import into."""
+        return "recorder" in self._hass.config.components
+
+    async def _async_load(self) -> None:
+        last = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, self.statistic_id, True, set()
+        )
+        if rows := last.get(self.statistic_id):
+            self.imported_until = rows[0]["start"] + HOUR
+        self._loaded = True
+
+    async def async_import(self, prices: PriceTimeline, force: bool = False) -> int:
+        """Import the hours of a delivery day in one batch, return their number.
+
+        Hours before the last imported one are skipped unless forced, which
+        backfills use to fill in older days.
+        """
+        if not prices or not self.enabled:
+            return 0
+        if not self._loaded:
+            await self._async_load()
+
+        statistics = hourly_statistics(prices, None if force else self.imported_until)
+        if not statistics:
+            return 0
+
+        async_add_external_statistics(self._hass, self.metadata, statistics)
+        end = statistics[-1]["start"].timestamp() + HOUR
+        if self.imported_until is None or end > self.imported_until:
+            self.imported_until = end
+        LOGGER.debug("Imported %s hours of %s", len(statistics), self.statistic_id)
+        return len(statistics)
@@ -0,0 +1,72 @@
+"""Counters behind the diagnostics."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+# upper bounds of the latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class CacheStats:
+    """Hits and misses of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def record(self, hit: bool) -> None:
+        """Count a lookup."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the share of lookups that were hits in percent."""
+        if not (total := self.hits + self.misses):
+            return None
+        return self.hits / total * 100
+
+
+@dataclass
+class TimingStats:
+    """Durations of a repeated piece of work in seconds."""
+
+    count: int = 0
+    total: float = 0.0
+    last: float | None = None
+    max: float = 0.0
+
+    def record(self, duration: float) -> None:
+        """Count a run."""
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        self.max = max(self.max, duration)
+
+    @property
+    def average(self) -> float | None:
+        """Return the average duration."""
+        return self.total / self.count if self.count else None
+
+
+@dataclass
+class LatencyHistogram:
+    """Latencies counted in LATENCY_BUCKETS, the last bucket is open."""
+
+    counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    def record(self, latency: float) -> None:
+        """Count a latency."""
+        self.counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the counts keyed by bucket."""
+        labels = [f"<= {bound:g} s" for bound in LATENCY_BUCKETS]
+        labels.append(f"> {LATENCY_BUCKETS[-1]:g} s")
+        return dict(zip(labels, self.counts))
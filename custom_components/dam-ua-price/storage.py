@@ -0,0 +1,132 @@
+"""Persistent storage of fetched delivery days."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from datetime import date, datetime
+from typing import TypedDict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+from .stats import CacheStats
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.prices"
+# fetched days are collected for a while and written together
+SAVE_DELAY = 30
+
+
+class StoredDay(TypedDict):
+    """A delivery day as kept on disk."""
+
+    fetched_at: str
+    prices: list[float]
+
+
+class StoredShard(TypedDict):
+    """One month of delivery days as kept on disk."""
+
+    days: dict[str, StoredDay]
+
+
+def shard_id(day: date) -> str:
+    """Return the id of the shard holding a delivery day."""
+    return f"{day.year:04d}_{day.month:02d}"
+
+
+class DAMPriceStore:
+    """Store of delivery day prices, sharded by month.
+
+    Only the shards that are actually asked for are read, so a warm start
+    does not have to load the whole history. Writes are batched with
+    ``Store.async_delay_save`` and replace the file atomically.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str = STORAGE_KEY) -> None:
+        """Initialize the store."""
+        self._hass = hass
+        self._key = key
+        self._stores: dict[str, Store[StoredShard]] = {}
+        self._shards: dict[str, StoredShard] = {}
+        # calls asking for a shard that is being read wait for that read
+        self._loading: dict[str, asyncio.Lock] = {}
+        self._dirty: set[str] = set()
+        self.stats = CacheStats()
+
+    @property
+    def loaded_days(self) -> int:
+        """Return the number of days in the shards held in memory."""
+        return sum(len(shard["days"]) for shard in self._shards.values())
+
+    def _store(self, shard: str) -> Store[StoredShard]:
+        if (store := self._stores.get(shard)) is None:
+            store = self._stores[shard] = Store(
+                self._hass,
+                STORAGE_VERSION,
+                f"{self._key}.{shard}",
+                atomic_writes=True,
+            )
+        return store
+
+    async def _async_shard(self, shard: str) -> StoredShard:
+        if (data := self._shards.get(shard)) is not None:
+            return data
+        async with self._loading.setdefault(shard, asyncio.Lock()):
+            if (data := self._shards.get(shard)) is None:
+                loaded = await self._store(shard).async_load()
+                data = self._shards[shard] = loaded or StoredShard(days={})
+                LOGGER.debug("Loaded %s cached days of %s", len(data["days"]), shard)
+        return data
+
+    async def async_load_days(
+        self, days: Iterable[date]
+    ) -> dict[date, tuple[datetime | None, list[float]]]:
+        """Return the cached days out of the requested ones."""
+        result: dict[date, tuple[datetime | None, list[float]]] = {}
+
+        for day in days:
+            shard = await self._async_shard(shard_id(day))
+            stored = shard["days"].get(day.isoformat())
+            self.stats.record(stored is not None)
+            if stored is None:
+                continue
+            result[day] = (dt_util.parse_datetime(stored["fetched_at"]), stored["prices"])
+
+        return result
+
+    async def async_has_day(self, day: date) -> bool:
+        """Return whether a delivery day is cached."""
+        shard = await self._async_shard(shard_id(day))
+        cached = day.isoformat() in shard["days"]
+        self.stats.record(cached)
+        return cached
+
+    async def async_put_day(
+        self, day: date, fetched_at: datetime, prices: list[float]
+    ) -> None:
+        """Cache a delivery day, the write happens batched later."""
+        key = shard_id(day)
+        shard = await self._async_shard(key)
+        shard["days"][day.isoformat()] = StoredDay(
+            fetched_at=fetched_at.isoformat(), prices=list(prices)
+        )
+        self._dirty.add(key)
+        self._store(key).async_delay_save(lambda: self._written(key), SAVE_DELAY)
+
+    def _written(self, shard: str) -> StoredShard:
+        self._dirty.discard(shard)
+        return self._shards[shard]
+
+    async def async_flush(self) -> None:
+        """Write all pending changes right away."""
+        for key in list(self._dirty):
+            await self._store(key).async_save(self._written(key))
+
+    def release(self) -> None:
+        """Drop the loaded shards without pending changes from memory."""
+        for key in [key for key in self._shards if key not in self._dirty]:
+            del self._shards[key]
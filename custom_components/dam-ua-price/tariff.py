@@ -0,0 +1,240 @@
+"""Time of use tariffs compiled to rate tables."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Any
+
+from .timeline import PriceTimeline
+
+DAY_TYPES = ("weekday", "weekend", "holiday")
+RATE_MAX = 10.0
+
+# the schedules of the 1, 2 and 3 zone meters, as rates from a time of day on
+PRESETS: dict[str, dict[str, Any]] = {
+    "1": {"weekday": {"00:00": 1.0}},
+    "2": {"weekday": {"00:00": 0.5, "07:00": 1.0, "23:00": 0.5}},
+    "3": {
+        "weekday": {
+            "00:00": 0.4,
+            "07:00": 1.0,
+            "08:00": 1.5,
+            "12:00": 1.0,
+            "20:00": 1.5,
+            "23:00": 0.4,
+        }
+    },
+}
+
+
+@dataclass(frozen=True, slots=True)
+class DayProfile:
+    """Rates of one day, each from its minute of the day until the next one.
+
+    Before the first minute the last rate of the day applies, so a profile
+    like 07:00 1.0, 23:00 0.5 covers the night as well.
+    """
+
+    minutes: tuple[int, ...]
+    rates: tuple[float, ...]
+
+    def rate_at(self, minute: int) -> float:
+        """Return the rate at a minute of the day."""
+        return self.rates[bisect_right(self.minutes, minute) - 1]
+
+    def next_change(self, minute: int) -> int | None:
+        """Return the minute of the next rate change today."""
+        index = bisect_right(self.minutes, minute)
+        return self.minutes[index] if index < len(self.minutes) else None
+
+
+@dataclass(frozen=True, slots=True)
+class TariffPeriod:
+    """Day profiles used from a date on."""
+
+    effective_from: date
+    weekday: DayProfile
+    weekend: DayProfile
+    holiday: DayProfile
+
+
+def parse_profile(config: Any, name: str) -> DayProfile:
+    """Return the day profile of a mapping of times to rates."""
+    if not isinstance(config, dict) or not config:
+        raise ValueError(f"{name} must map times like 07:00 to rates")
+
+    rates: dict[int, float] = {}
+    for key, rate in config.items():
+        try:
+            start = time.fromisoformat(str(key))
+        except ValueError:
+            raise ValueError(f"{name}: {key!r} is not a time like 07:00") from None
+        if isinstance(rate, bool) or not isinstance(rate, (int, float)):
+            raise ValueError(f"{name}: rate at {key} is not a number")
+        if not 0 <= rate <= RATE_MAX:
+            raise ValueError(f"{name}: rate at {key} is outside 0 to {RATE_MAX:g}")
+        rates[start.hour * 60 + start.minute] = float(rate)
+
+    minutes = tuple(sorted(rates))
+    return DayProfile(minutes, tuple(rates[minute] for minute in minutes))
+
+
+def parse_period(config: Any, name: str) -> TariffPeriod:
+    """Return a tariff period, weekends default to weekdays and holidays to weekends."""
+    if not isinstance(config, dict):
+        raise ValueError(f"{name} must be a mapping")
+    if unknown := set(config) - {"effective_from", *DAY_TYPES}:
+        raise ValueError(f"{name}: unknown keys {', '.join(sorted(map(str, unknown)))}")
+
+    effective_from = date.min
+    if (value := config.get("effective_from")) is not None:
+        try:
+            effective_from = (
+                value if isinstance(value, date) else date.fromisoformat(str(value))
+            )
+        except ValueError:
+            raise ValueError(f"{name}: {value!r} is not a date") from None
+
+    weekday = parse_profile(config.get("weekday"), f"{name} weekday")
+    weekend = (
+        parse_profile(config["weekend"], f"{name} weekend")
+        if "weekend" in config
+        else weekday
+    )
+    holiday = (
+        parse_profile(config["holiday"], f"{name} holiday")
+        if "holiday" in config
+        else weekend
+    )
+    return TariffPeriod(effective_from, weekday, weekend, holiday)
+
+
+class TariffSchedule:
+    """Zone rates of a household meter over time.
+
+    The schedule is compiled once into a profile per day, and rate tables
+    for timelines are built from those, so looking up the rate of a slot is
+    an array index.
+    """
+
+    def __init__(
+        self, periods: list[TariffPeriod], holidays: frozenset[date] = frozenset()
+    ) -> None:
+        """Initialize the schedule."""
+        self.periods = sorted(periods, key=lambda period: period.effective_from)
+        self._starts = [period.effective_from for period in self.periods]
+        self.holidays = holidays
+        self._profiles: dict[date, DayProfile] = {}
+
+    @classmethod
+    def from_config(cls, config: Any) -> TariffSchedule:
+        """Return the schedule of a tariff definition, ValueError says what is wrong.
+
+        The definition has weekday, weekend and holiday profiles, either at
+        the top level or in a list of periods with an effective_from date,
+        and an optional list of holidays.
+        """
+        if not isinstance(config, dict):
+            raise ValueError("the tariff must be a mapping")
+
+        holidays: set[date] = set()
+        for value in config.get("holidays") or ():
+            try:
+                holidays.add(
+                    value if isinstance(value, date) else date.fromisoformat(str(value))
+                )
+            except ValueError:
+                raise ValueError(f"holiday {value!r} is not a date") from None
+
+        if "periods" in config:
+            if not isinstance(config["periods"], list) or not config["periods"]:
+                raise ValueError("periods must be a list of tariff periods")
+            periods = [
+                parse_period(period, f"period {number}")
+                for number, period in enumerate(config["periods"], 1)
+            ]
+        else:
+            periods = [
+                parse_period(
+                    {key: value for key, value in config.items() if key != "holidays"},
+                    "tariff",
+                )
+            ]
+
+        return cls(periods, frozenset(holidays))
+
+    @classmethod
+    def preset(cls, meter_zones: str) -> TariffSchedule:
+        """Return the schedule of a 1, 2 or 3 zone meter."""
+        return cls.from_config(PRESETS.get(meter_zones, PRESETS["2"]))
+
+    def profile(self, day: date) -> DayProfile:
+        """Return the rates of a day."""
+        if (profile := self._profiles.get(day)) is None:
+            index = bisect_right(self._starts, day) - 1
+            # days before the first period use it anyway
+            period = self.periods[max(index, 0)]
+            if day in self.holidays:
+                profile = period.holiday
+            elif day.weekday() >= 5:
+                profile = period.weekend
+            else:
+                profile = period.weekday
+            self._profiles[day] = profile
+        return profile
+
+    def rate_at(self, when: datetime, tz: tzinfo) -> float:
+        """Return the rate at a point in time."""
+        local = when.astimezone(tz)
+        return self.profile(local.date()).rate_at(local.hour * 60 + local.minute)
+
+    def next_change(self, when: datetime, tz: tzinfo) -> datetime:
+        """Return when the rate may change next, at the latest the next midnight."""
+        local = when.astimezone(tz)
+        minute = self.profile(local.date()).next_change(local.hour * 60 + local.minute)
+        if minute is None:
+            next_day = local.date() + timedelta(days=1)
+            return datetime.combine(next_day, time(), tz)
+        return datetime.combine(local.date(), time(minute // 60, minute % 60), tz)
+
+    def rates(self, timeline: PriceTimeline, tz: tzinfo) -> array:
+        """Return the average rate over every slot of a timeline.
+
+        A rate changing within a slot counts for the part of the slot it
+        applies to, so a change at 07:30 halves an hourly slot.
+        """
+        starts = timeline.starts
+        ends = timeline.ends
+        rates = array("d", bytes(8 * len(starts)))
+        index = 0
+        while index < len(starts):
+            day = datetime.fromtimestamp(starts[index], tz).date()
+            profile = self.profile(day)
+            day_end = datetime.combine(day + timedelta(days=1), time(), tz).timestamp()
+            last = bisect_left(starts, day_end, index)
+            # changes are placed in real time, the wall clock jumps on DST days
+            changes = [
+                datetime.combine(day, time(minute // 60, minute % 60), tz).timestamp()
+                for minute in profile.minutes
+            ]
+
+            for slot in range(index, last):
+                start, end = starts[slot], ends[slot]
+                change = bisect_right(changes, start)
+                # before the first change the last rate of the day applies
+                rate = profile.rates[change - 1]
+                if change == len(changes) or changes[change] >= end:
+                    rates[slot] = rate
+                    continue
+
+                total, since = 0.0, start
+                while change < len(changes) and changes[change] < end:
+                    total += rate * (changes[change] - since)
+                    since, rate = changes[change], profile.rates[change]
+                    change += 1
+                rates[slot] = (total + rate * (end - since)) / (end - start)
+            index = last
+        return rates
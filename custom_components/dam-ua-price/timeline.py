@@ -0,0 +1,166 @@
+"""Compact timeline of price slots."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta, tzinfo
+from functools import lru_cache
+from typing import Any
+
+from .utils import TimeRangePrice
+
+# the products traded on the DAM: hours, half hours and quarter hours
+SLOT_LENGTHS = (3600, 1800, 900)
+
+
+@lru_cache(maxsize=64)
+def slot_grid(day: date, count: int, tz: tzinfo) -> tuple[float, ...] | None:
+    """Return the count + 1 slot boundaries of a delivery day.
+
+    Days are split into slots of one of the SLOT_LENGTHS, so DST days have
+    23 or 25 hourly slots and 15-minute products have 92, 96 or 100. None
+    means count slots are not a grid of the day, as for a truncated day.
+    """
+    if count <= 0:
+        return None
+
+    next_day = day + timedelta(days=1)
+    start = datetime(day.year, day.month, day.day, tzinfo=tz).timestamp()
+    end = datetime(next_day.year, next_day.month, next_day.day, tzinfo=tz).timestamp()
+
+    length, remainder = divmod(round(end - start), count)
+    if remainder or length not in SLOT_LENGTHS:
+        return None
+
+    return tuple(start + i * length for i in range(count + 1))
+
+
+class PriceTimeline:
+    """Price slots ordered by start, kept in contiguous arrays.
+
+    Slot starts and ends are POSIX timestamps, values are UAH/kWh. Lookups
+    bisect the starts instead of walking every slot.
+    """
+
+    __slots__ = ("starts", "ends", "values")
+
+    def __init__(
+        self,
+        starts: Iterable[float] = (),
+        ends: Iterable[float] = (),
+        values: Iterable[float] = (),
+    ) -> None:
+        """Initialize the timeline."""
+        self.starts = array("d", starts)
+        self.ends = array("d", ends)
+        self.values = array("d", values)
+
+    @classmethod
+    def for_day(
+        cls, day: date, values: Iterable[float], tz: tzinfo
+    ) -> PriceTimeline | None:
+        """Return the timeline of a delivery day, None if values do not fit it."""
+        if not isinstance(values, array):
+            values = array("d", values)
+        if (grid := slot_grid(day, len(values), tz)) is None:
+            return None
+
+        timeline = cls()
+        timeline.starts = array("d", grid[:-1])
+        timeline.ends = array("d", grid[1:])
+        timeline.values = values
+        return timeline
+
+    @classmethod
+    def concat(cls, timelines: Iterable[PriceTimeline]) -> PriceTimeline:
+        """Return one timeline made of timelines following each other."""
+        result = cls()
+        for timeline in timelines:
+            result.starts.extend(timeline.starts)
+            result.ends.extend(timeline.ends)
+            result.values.extend(timeline.values)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return len(self.starts) > 0
+
+    def __iter__(self) -> Iterator[TimeRangePrice]:
+        return (TimeRangePrice(self, i) for i in range(len(self.starts)))
+
+    def __getitem__(self, index: int) -> TimeRangePrice:
+        if index < 0:
+            index += len(self.starts)
+        if not 0 <= index < len(self.starts):
+            raise IndexError("slot index out of range")
+        return TimeRangePrice(self, index)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the size of the slot arrays in bytes."""
+        return sum(
+            len(values) * values.itemsize
+            for values in (self.starts, self.ends, self.values)
+        )
+
+    def __repr__(self) -> str:
+        return f"PriceTimeline({len(self)} slots)"
+
+    def append(self, start: float, end: float, value: float) -> None:
+        """Add a slot after the last one."""
+        self.starts.append(start)
+        self.ends.append(end)
+        self.values.append(value)
+
+    def index_at(self, timestamp: float) -> int | None:
+        """Return the index of the slot containing a timestamp."""
+        index = bisect_right(self.starts, timestamp) - 1
+        if index >= 0 and timestamp < self.ends[index]:
+            return index
+        return None
+
+    def price_at(self, timestamp: float) -> float | None:
+        """Return the price at a timestamp."""
+        if (index := self.index_at(timestamp)) is None:
+            return None
+        return self.values[index]
+
+    def next_boundary(self, timestamp: float) -> float | None:
+        """Return the first slot start or end after a timestamp."""
+        if (index := self.index_at(timestamp)) is not None:
+            return self.ends[index]
+
+        index = bisect_right(self.starts, timestamp)
+        if index < len(self.starts):
+            return self.starts[index]
+        return None
+
+    def range_slice(self, start: float, end: float) -> PriceTimeline:
+        """Return the slots overlapping the [start, end) interval."""
+        first = bisect_right(self.starts, start) - 1
+        if first < 0 or self.ends[first] <= start:
+            first += 1
+        last = bisect_left(self.starts, end)
+        return PriceTimeline(
+            self.starts[first:last], self.ends[first:last], self.values[first:last]
+        )
+
+    def as_dict(self, tz: tzinfo) -> dict[str, Any] | None:
+        """Return the slots of a delivery day in a compact form.
+
+        Slots of a day have equal length, so only the bounds and the slot
+        length are given next to the plain list of prices.
+        """
+        if not self:
+            return None
+
+        return {
+            "start": datetime.fromtimestamp(self.starts[0], tz).isoformat(),
+            "end": datetime.fromtimestamp(self.ends[-1], tz).isoformat(),
+            "slot_minutes": round((self.ends[0] - self.starts[0]) / 60),
+            "prices": self.values.tolist(),
+        }
@@ -1,13 +1,37 @@
-from dataclasses import dataclass
+from __future__ import annotations
 
-@dataclass(frozen=True)
-class TimeRangePrice(float):
-    start: float
-    end: float
-    value: float
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .timeline import PriceTimeline
+
+
+class TimeRangePrice:
+    """A single price slot, a view over a PriceTimeline."""
+
+    __slots__ = ("_timeline", "_index")
+
+    def __init__(self, timeline: PriceTimeline, index: int) -> None:
+        self._timeline = timeline
+        self._index = index
+
+    @property
+    def start(self) -> float:
+        return self._timeline.starts[self._index]
+
+    @property
+    def end(self) -> float:
+        return self._timeline.ends[self._index]
+
+    @property
+    def value(self) -> float:
+        return self._timeline.values[self._index]
 
     def contains(self, dt: float) -> bool:
         return self.start <= dt < self.end
 
     def duration(self) -> float:
-        return self.end - self.start
\ No newline at end of file
+        return self.end - self.start
+
+    def __repr__(self) -> str:
+        return f"TimeRangePrice(start={self.start}, end={self.end}, value={self.value})"
@@ -0,0 +1,120 @@
+"""Cheapest time windows over a price timeline."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from heapq import nsmallest
+from math import ceil
+from typing import Any
+
+from .timeline import PriceTimeline
+
+
+@dataclass(frozen=True, slots=True)
+class PriceWindow:
+    """Slots of a timeline chosen for their price."""
+
+    indexes: tuple[int, ...]
+    average: float
+
+    def start(self, timeline: PriceTimeline) -> float:
+        """Return the start of the first slot."""
+        return timeline.starts[self.indexes[0]]
+
+    def end(self, timeline: PriceTimeline) -> float:
+        """Return the end of the last slot."""
+        return timeline.ends[self.indexes[-1]]
+
+    def as_dict(self, timeline: PriceTimeline, tz: tzinfo) -> dict[str, Any]:
+        """Return the window with ISO formatted times."""
+        return {
+            "start": datetime.fromtimestamp(self.start(timeline), tz).isoformat(),
+            "end": datetime.fromtimestamp(self.end(timeline), tz).isoformat(),
+            "average": self.average,
+            "slots": [
+                {
+                    "start": datetime.fromtimestamp(timeline.starts[index], tz).isoformat(),
+                    "end": datetime.fromtimestamp(timeline.ends[index], tz).isoformat(),
+                    "price": timeline.values[index],
+                }
+                for index in self.indexes
+            ],
+        }
+
+
+def _bounds(
+    timeline: PriceTimeline, earliest: float, deadline: float | None
+) -> tuple[int, int]:
+    """Return the index range of slots starting and ending within the limits."""
+    first = bisect_left(timeline.starts, earliest)
+    last = len(timeline) if deadline is None else bisect_right(timeline.ends, deadline)
+    return first, last
+
+
+def cheapest_window(
+    timeline: PriceTimeline,
+    duration: float,
+    earliest: float,
+    deadline: float | None = None,
+) -> PriceWindow | None:
+    """Return the cheapest run of consecutive slots lasting at least duration.
+
+    One pass with a sliding window, the window restarts at gaps between
+    slots. The average is weighted by slot length.
+    """
+    starts, ends, values = timeline.starts, timeline.ends, timeline.values
+    first, last = _bounds(timeline, earliest, deadline)
+
+    best: tuple[float, int, int] | None = None
+    head = first
+    covered = 0.0
+    cost = 0.0
+
+    for index in range(first, last):
+        if index > head and starts[index] != ends[index - 1]:
+            head = index
+            covered = cost = 0.0
+
+        length = ends[index] - starts[index]
+        covered += length
+        cost += values[index] * length
+
+        # drop slots from the head while the rest still lasts long enough
+        while covered - (ends[head] - starts[head]) >= duration:
+            length = ends[head] - starts[head]
+            covered -= length
+            cost -= values[head] * length
+            head += 1
+
+        if covered >= duration and (best is None or cost / covered < best[0]):
+            best = (cost / covered, head, index)
+
+    if best is None:
+        return None
+
+    average, head, tail = best
+    return PriceWindow(tuple(range(head, tail + 1)), average)
+
+
+def cheapest_slots(
+    timeline: PriceTimeline,
+    duration: float,
+    earliest: float,
+    deadline: float | None = None,
+) -> PriceWindow | None:
+    """Return the cheapest slots, not necessarily consecutive, lasting duration."""
+    first, last = _bounds(timeline, earliest, deadline)
+    if first >= last:
+        return None
+
+    count = ceil(duration / (timeline.ends[first] - timeline.starts[first]))
+    if not 0 < count <= last - first:
+        return None
+
+    values = timeline.values
+    indexes = sorted(nsmallest(count, range(first, last), key=values.__getitem__))
+    return PriceWindow(
+        tuple(indexes), sum(values[index] for index in indexes) / count
+    )
@@ -0,0 +1,462 @@
+"""Benchmarks of the price computation and coordinator update paths.
+
+Runs against OREE shaped payloads without network access. The payloads are
+generated from a fixed seed, or read from a directory of recorded responses
+written by --record. The coordinator cases need Home Assistant installed (see
+scripts/setup) and run on a bare core instance in a temporary config
+directory, with the OREE session replaced by one answering from the payloads.
+
+    python3 scripts/benchmark.py             compare with the saved baseline
+    python3 scripts/benchmark.py --save      save the results as the baseline
+    python3 scripts/benchmark.py --record D  record real OREE payloads into D
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+import importlib.util
+import json
+from pathlib import Path
+import random
+import statistics
+import sys
+import tempfile
+import time
+from types import ModuleType
+from typing import Any
+from zoneinfo import ZoneInfo
+
+ROOT = Path(__file__).resolve().parent.parent
+INTEGRATION = ROOT / "custom_components" / "dam-ua-price"
+# the directory name has a hyphen, so the package is loaded under this name
+PACKAGE = "dam_ua_price"
+BASELINE = ROOT / ".benchmarks" / "baseline.json"
+
+DAYS = (1, 7, 365)
+RESOLUTIONS = (60, 15)
+LAST_DAY = date(2026, 10, 1)
+REPEAT = 5
+MIN_TIME = 0.2
+TOLERANCE = 1.25
+
+kiev_tz = ZoneInfo("Europe/Kiev")
+
+
+def load_integration() -> ModuleType:
+    """Import the integration as a package, fully if Home Assistant is there.
+
+    Without Home Assistant the package module is only registered, so the
+    modules not depending on it can still be imported.
+    """
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE,
+        INTEGRATION / "__init__.py",
+        submodule_search_locations=[str(INTEGRATION)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = module
+    if has_homeassistant():
+        spec.loader.exec_module(module)
+    return module
+
+
+def has_homeassistant() -> bool:
+    """Return if Home Assistant can be imported."""
+    return importlib.util.find_spec("homeassistant") is not None
+
+
+def import_module(name: str) -> ModuleType:
+    """Import a module of the integration."""
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+def slot_count(day: date, resolution: int) -> int:
+    """Return the number of slots of a delivery day in Kyiv."""
+    start = datetime(day.year, day.month, day.day, tzinfo=kiev_tz)
+    next_day = day + timedelta(days=1)
+    end = datetime(next_day.year, next_day.month, next_day.day, tzinfo=kiev_tz)
+    return round((end.timestamp() - start.timestamp()) / 60 / resolution)
+
+
+def synthetic_payload(day: date, resolution: int, count: int | None = None) -> bytes:
+    """Return an OREE response with a plausible daily price curve in UAH/MWh."""
+    rng = random.Random(f"{day.isoformat()}-{resolution}")
+    if count is None:
+        count = slot_count(day, resolution)
+    prices = []
+    for slot in range(count):
+        hour = slot * resolution / 60
+        base = 5500 if 8 <= hour < 23 else 3000
+        prices.append(round(base + rng.uniform(-1500, 1500), 2))
+    return json.dumps({"pricesData": prices}).encode()
+
+
+class Payloads:
+    """OREE responses per delivery day and resolution."""
+
+    def __init__(self, directory: Path | None) -> None:
+        """Initialize from a directory of recordings, or synthetic ones."""
+        self.directory = directory
+        self._cache: dict[tuple[date, int], bytes] = {}
+
+    def get(self, day: date, resolution: int) -> bytes:
+        """Return the response of a day."""
+        key = (day, resolution)
+        if key not in self._cache:
+            recorded = (
+                self.directory / f"{day.isoformat()}_{resolution}.json"
+                if self.directory
+                else None
+            )
+            self._cache[key] = (
+                recorded.read_bytes()
+                if recorded and recorded.exists()
+                else synthetic_payload(day, resolution)
+            )
+        return self._cache[key]
+
+
+class FakeResponse:
+    """Response of the fake OREE session."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def __aenter__(self) -> FakeResponse:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self, content_type: str | None = None) -> Any:
+        return json.loads(self._body)
+
+
+class FakeSession:
+    """Session answering the OREE price URLs from the payloads."""
+
+    def __init__(self, payloads: Payloads, resolution: int) -> None:
+        self._payloads = payloads
+        self._resolution = resolution
+
+    def post(self, url: str, **kwargs: Any) -> FakeResponse:
+        day = datetime.strptime(url.split("/")[-3], "%d.%m.%Y").date()
+        return FakeResponse(self._payloads.get(day, self._resolution))
+
+
+def measure(function: Callable[[], Any]) -> float:
+    """Return the best time of one call in seconds."""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_TIME:
+            break
+        number *= 2 if elapsed * 4 > MIN_TIME else 10
+
+    timings = [elapsed / number]
+    for _ in range(REPEAT - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - started) / number)
+    return min(timings)
+
+
+async def async_measure(function: Callable[[], Awaitable[Any]]) -> float:
+    """Return the best time of one awaited call in seconds."""
+    timings = []
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            await function()
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed / number)
+        if elapsed >= MIN_TIME and len(timings) >= REPEAT:
+            break
+        if elapsed < MIN_TIME:
+            number *= 2
+    return min(timings)
+
+
+def days_back(count: int) -> list[date]:
+    """Return the delivery days ending with the last benchmarked day."""
+    return [LAST_DAY - timedelta(days=offset) for offset in range(count - 1, -1, -1)]
+
+
+def pure_cases(payloads: Payloads) -> dict[str, float]:
+    """Benchmark the modules that do not need Home Assistant."""
+    timeline_module = import_module("timeline")
+    snapshot_module = import_module("snapshot")
+    windows = import_module("windows")
+    battery = import_module("battery")
+    parsing = import_module("parsing")
+    PriceTimeline = timeline_module.PriceTimeline
+    results: dict[str, float] = {}
+
+    for resolution in RESOLUTIONS:
+        for count in DAYS:
+            days = days_back(count)
+            bodies = [(day, payloads.get(day, resolution)) for day in days]
+            name = f"{count}d/{resolution}m"
+
+            def parse() -> list[Any]:
+                return [
+                    parsing.parse_prices(parsing.json_loads(body), day, kiev_tz)
+                    for day, body in bodies
+                ]
+
+            timelines = parse()
+            results[f"parse {name}"] = measure(parse)
+            results[f"concat {name}"] = measure(
+                lambda: PriceTimeline.concat(timelines)
+            )
+
+            timeline = PriceTimeline.concat(timelines)
+            today = timelines[-1]
+            index = len(timeline) - len(today) // 2
+            results[f"snapshot {name}"] = measure(
+                lambda: snapshot_module.PriceSnapshot.build(
+                    timeline, today, index, 1.0, 4.32, kiev_tz
+                )
+            )
+
+            earliest = timeline.starts[0]
+            results[f"cheapest {name}"] = measure(
+                lambda: (
+                    windows.cheapest_window(timeline, 3 * 3600, earliest),
+                    windows.cheapest_slots(timeline, 3 * 3600, earliest),
+                )
+            )
+
+        # the coordinator plans from the current slot to the end of tomorrow
+        horizon = PriceTimeline.concat(
+            parsing.parse_prices(
+                parsing.json_loads(payloads.get(day, resolution)), day, kiev_tz
+            )
+            for day in days_back(2)
+        )
+        durations = [
+            (end - start) / 3600 for start, end in zip(horizon.starts, horizon.ends)
+        ]
+        buy = [value * 1.2 for value in horizon.values]
+        sell = list(horizon.values)
+        config = battery.BatteryConfig(10, 5, 5, 0.9)
+
+        def plan() -> Any:
+            planner = battery.BatteryPlanner(config, 5)
+            planner.extend(durations, buy, sell)
+            return planner.plan()
+
+        results[f"battery 2d/{resolution}m"] = measure(plan)
+
+    return results
+
+
+class StubConfigEntry:
+    """Config entry holding only what the coordinator reads."""
+
+    entry_id = "benchmark"
+    title = "DAM benchmark"
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.data = data
+        self.options: dict[str, Any] = {}
+
+    def async_on_unload(self, func: Callable[[], Any]) -> None:
+        return None
+
+
+async def async_coordinator_cases(payloads: Payloads) -> dict[str, float]:
+    """Benchmark the coordinator paths on a bare Home Assistant instance."""
+    from homeassistant.core import HomeAssistant
+    from homeassistant.util import dt as dt_util
+
+    api = import_module("api")
+    coordinator_module = import_module("coordinator")
+    source_module = import_module("source")
+    sensor = import_module("sensor")
+    results: dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for resolution in RESOLUTIONS:
+            for count in DAYS:
+                name = f"{count}d/{resolution}m"
+                days = days_back(count)
+                entry = StubConfigEntry(
+                    {"meter_zones": "2", "price": 4.32, "retention_days": count}
+                )
+                source = source_module.DAMPriceSource(hass)
+                client = api.OREEClient(FakeSession(payloads, resolution))
+                source.client = client
+                coordinator = coordinator_module.DAMDataUpdateCoordinator(
+                    hass, entry, source
+                )
+                series = coordinator.primary
+                series.client = client
+
+                async def fetch() -> None:
+                    await series.async_fetch_day(days[-1])
+
+                results[f"fetch {name}"] = await async_measure(fetch)
+                series.store.release()
+
+                for day in days:
+                    series.set_day(day, await series.async_fetch_day(day))
+                now = datetime.fromtimestamp(
+                    series.timeline.starts[-len(series.get_day(days[-1])) // 2],
+                    dt_util.UTC,
+                )
+                dt_util_utcnow = dt_util.utcnow
+                dt_util.utcnow = lambda: now
+                try:
+
+                    def snapshot() -> Any:
+                        coordinator._snapshots.clear()
+                        return coordinator.get_snapshot()
+
+                    results[f"get_snapshot {name}"] = measure(snapshot)
+
+                    entities = [
+                        cls(coordinator, description)
+                        for cls, descriptions in (
+                            (sensor.DAMSensor, sensor.DEFAULT_SENSOR_TYPES),
+                            (sensor.DAMSensor, sensor.FORECAST_SENSOR_TYPES),
+                            (sensor.DAMSensor, sensor.CHEAPEST_SENSOR_TYPES),
+                            (sensor.DAMPriceSensor, sensor.PRICES_SENSOR_TYPES),
+                            (
+                                sensor.DAMDailyAveragePriceSensor,
+                                sensor.DAILY_AVERAGE_PRICES_SENSOR_TYPES,
+                            ),
+                        )
+                        for description in descriptions
+                    ]
+                    for entity in entities:
+                        coordinator.async_add_listener(
+                            lambda entity=entity: (
+                                entity.available,
+                                entity.native_value,
+                                entity.extra_state_attributes,
+                            ),
+                            entity.coordinator_context,
+                        )
+
+                    def fan_out() -> None:
+                        # a new slot with every derived value recomputed
+                        coordinator._snapshots.clear()
+                        coordinator._cheapest.clear()
+                        coordinator._forecasts.clear()
+                        coordinator._notified.clear()
+                        coordinator.async_update_changed()
+
+                    results[f"fan-out {name}"] = measure(fan_out)
+                    results[f"fan-out unchanged {name}"] = measure(
+                        coordinator.async_update_changed
+                    )
+                finally:
+                    dt_util.utcnow = dt_util_utcnow
+
+                await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    return results
+
+
+async def async_record(directory: Path) -> None:
+    """Record real OREE responses of the benchmarked days."""
+    import aiohttp
+
+    api = import_module("api")
+    directory.mkdir(parents=True, exist_ok=True)
+    async with aiohttp.ClientSession() as session:
+        client = api.OREEClient(session)
+        for day in days_back(max(DAYS)):
+            data = (await client.async_get_payload(day)).get("pricesData")
+            if not data:
+                print(f"{day}: not published")
+                continue
+            resolution = round(slot_count(day, 60) * 60 / len(data))
+            path = directory / f"{day.isoformat()}_{resolution}.json"
+            path.write_text(json.dumps({"pricesData": data}))
+            print(f"{day}: {len(data)} slots")
+
+
+def report(
+    results: dict[str, float], baseline: dict[str, float], tolerance: float
+) -> bool:
+    """Print the results next to the baseline, return if nothing regressed."""
+    passed = True
+    width = max(map(len, results))
+    for name, seconds in results.items():
+        line = f"{name:<{width}}  {seconds * 1000:10.3f} ms"
+        if name in baseline:
+            ratio = seconds / baseline[name]
+            line += f"  {ratio:5.2f}x"
+            if ratio > tolerance:
+                line += "  SLOWER"
+                passed = False
+        print(line)
+    return passed
+
+
+def main() -> int:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--save", action="store_true", help="save as baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=TOLERANCE,
+        help="slowdown against the baseline reported as a regression",
+    )
+    parser.add_argument("--payloads", type=Path, help="recorded OREE payloads")
+    parser.add_argument("--record", type=Path, help="record OREE payloads here")
+    args = parser.parse_args()
+
+    load_integration()
+    if args.record:
+        asyncio.run(async_record(args.record))
+        return 0
+
+    payloads = Payloads(args.payloads)
+    results = pure_cases(payloads)
+    if has_homeassistant():
+        results.update(asyncio.run(async_coordinator_cases(payloads)))
+    else:
+        print("homeassistant is not installed, coordinator cases skipped")
+    baseline: dict[str, float] = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    passed = report(results, baseline, args.tolerance)
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps({**baseline, **results}, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if ratios := [
+        results[name] / baseline[name] for name in results if name in baseline
+    ]:
+        print(f"Median ratio to the baseline {statistics.median(ratios):.2f}x")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""Local stand-in for the OREE price endpoint, with latency and faults.
+
+Answers POST /index.php/PXS/get_pxs_hdata/{date}/{market}/{zone} like OREE,
+with the payloads of scripts/benchmark.py, and can add latency, HTTP errors,
+truncated bodies, partial pricesData, days ignoring DST and a publication
+time before which the days after today are empty. GET /stats returns the
+request counters.
+
+    python3 scripts/oree_server.py serve --latency 0.3 --error-rate 0.1
+    python3 scripts/oree_server.py soak --coordinators 20 --days 90
+
+soak starts the server in process and backfills with several coordinators
+pointed at it, which needs Home Assistant installed (see scripts/setup).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta
+import json
+from pathlib import Path
+import random
+import tempfile
+from time import monotonic
+
+from aiohttp import web
+
+from benchmark import (
+    Payloads,
+    StubConfigEntry,
+    import_module,
+    kiev_tz,
+    load_integration,
+    synthetic_payload,
+)
+
+PRICES_PATH = "/index.php/PXS/get_pxs_hdata/{day}/{market}/{zone}"
+
+
+class OREEStandIn:
+    """Request handlers and fault injection of the stand-in server."""
+
+    def __init__(self, options: argparse.Namespace) -> None:
+        """Initialize the server from the command line options."""
+        self.options = options
+        self.payloads = Payloads(options.payloads)
+        self.rng = random.Random(options.seed)
+        self.counters = {
+            "requests": 0,
+            "errors": 0,
+            "truncated": 0,
+            "partial": 0,
+            "unpublished": 0,
+        }
+
+    def application(self) -> web.Application:
+        """Return the aiohttp application."""
+        app = web.Application()
+        app.router.add_post(PRICES_PATH, self.handle_prices)
+        app.router.add_get("/stats", self.handle_stats)
+        return app
+
+    def published(self, day: date) -> bool:
+        """Return if the prices of a day are out at the current time."""
+        now = datetime.now(kiev_tz)
+        if day <= now.date():
+            return True
+        return day == now.date() + timedelta(days=1) and (
+            self.options.publish_at is None or now.time() >= self.options.publish_at
+        )
+
+    async def handle_prices(self, request: web.Request) -> web.Response:
+        """Answer a price request."""
+        options = self.options
+        self.counters["requests"] += 1
+        try:
+            day = datetime.strptime(request.match_info["day"], "%d.%m.%Y").date()
+        except ValueError:
+            raise web.HTTPNotFound from None
+
+        if options.latency:
+            await asyncio.sleep(options.latency * (0.5 + self.rng.random()))
+
+        if self.rng.random() < options.error_rate:
+            self.counters["errors"] += 1
+            return web.Response(status=self.rng.choice(options.error_status))
+
+        if not self.published(day):
+            self.counters["unpublished"] += 1
+            return web.json_response({"pricesData": []})
+
+        if options.ignore_dst:
+            body = synthetic_payload(
+                day, options.resolution, 24 * 60 // options.resolution
+            )
+        else:
+            body = self.payloads.get(day, options.resolution)
+
+        if self.rng.random() < options.partial_rate:
+            self.counters["partial"] += 1
+            prices = json.loads(body)["pricesData"]
+            body = json.dumps(
+                {"pricesData": prices[: self.rng.randrange(len(prices))]}
+            ).encode()
+
+        if self.rng.random() < options.truncate_rate:
+            self.counters["truncated"] += 1
+            body = body[: self.rng.randrange(len(body))]
+
+        # OREE does not send a JSON content type either
+        return web.Response(body=body, content_type="text/html", charset="utf-8")
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        """Return the request counters."""
+        return web.json_response(self.counters)
+
+    async def async_start(self) -> tuple[web.AppRunner, str]:
+        """Start serving, return the runner and the OREE base URL."""
+        runner = web.AppRunner(self.application())
+        await runner.setup()
+        site = web.TCPSite(runner, self.options.host, self.options.port)
+        await site.start()
+        # the port the listening socket got, when 0 asked for a free one
+        host, port = runner.addresses[0][:2]
+        return runner, f"http://{host}:{port}/index.php"
+
+
+async def async_serve(options: argparse.Namespace) -> None:
+    """Serve until interrupted."""
+    runner, base_url = await OREEStandIn(options).async_start()
+    print(f"Serving OREE at {base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def async_soak(options: argparse.Namespace) -> None:
+    """Backfill with several coordinators against the stand-in."""
+    from homeassistant.core import HomeAssistant
+
+    coordinator_module = import_module("coordinator")
+    source_module = import_module("source")
+    storage = import_module("storage")
+
+    server = OREEStandIn(options)
+    runner, base_url = await server.async_start()
+    end = datetime.now(kiev_tz).date()
+    start = end - timedelta(days=options.days - 1)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinators = []
+        for number in range(options.coordinators):
+            # every coordinator gets its own source, as separate instances would
+            source = source_module.DAMPriceSource(hass, base_url)
+            coordinator = coordinator_module.DAMDataUpdateCoordinator(
+                hass, StubConfigEntry({"meter_zones": "2", "price": 4.32}), source
+            )
+            # every source keeps its own cache, so none skips days
+            for series in coordinator.series.values():
+                series.store = storage.DAMPriceStore(
+                    hass, f"{storage.STORAGE_KEY}.soak{number}.{series.key}"
+                )
+            coordinators.append(coordinator)
+
+        started = monotonic()
+        results = await asyncio.gather(
+            *(
+                coordinator.source.async_backfill(start, end)
+                for coordinator in coordinators
+            )
+        )
+        elapsed = monotonic() - started
+
+        fetched = sum(result["fetched"] for result in results)
+        missing = sum(len(result["missing"]) for result in results)
+        stats = [coordinator.client.stats for coordinator in coordinators]
+        latencies = [item.average_latency for item in stats if item.average_latency]
+        print(f"{len(coordinators)} coordinators, {options.days} days in {elapsed:.1f}s")
+        print(f"fetched {fetched}, missing {missing}")
+        print(
+            f"client requests {sum(item.requests for item in stats)}, "
+            f"failures {sum(item.failures for item in stats)}, "
+            f"retries {sum(item.retries for item in stats)}"
+        )
+        if latencies:
+            print(f"average latency {sum(latencies) / len(latencies) * 1000:.1f} ms")
+        print(f"server {server.counters}")
+
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    await runner.cleanup()
+
+
+def parse_time(value: str) -> time:
+    """Parse a HH:MM time."""
+    return datetime.strptime(value, "%H:%M").time()
+
+
+def main() -> None:
+    """Run the stand-in server or a soak test."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("command", choices=("serve", "soak"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", type=int, help="8099 when serving, a free one for soak"
+    )
+    parser.add_argument("--payloads", type=Path, help="recorded OREE payloads")
+    parser.add_argument("--resolution", type=int, choices=(60, 15), default=60)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--error-status", type=int, nargs="+", default=[500, 502, 503, 429]
+    )
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--partial-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--ignore-dst",
+        action="store_true",
+        help="send 24 hours of prices on days with 23 or 25",
+    )
+    parser.add_argument(
+        "--publish-at",
+        type=parse_time,
+        help="Kyiv time tomorrow's prices appear, at once if not given",
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--coordinators", type=int, default=10)
+    parser.add_argument("--days", type=int, default=31)
+    options = parser.parse_args()
+
+    if options.command == "serve":
+        if options.port is None:
+            options.port = 8099
+        asyncio.run(async_serve(options))
+    else:
+        if options.port is None:
+            options.port = 0
+        load_integration()
+        asyncio.run(async_soak(options))
+
+
+if __name__ == "__main__":
+    main()
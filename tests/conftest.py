@@ -0,0 +1,66 @@
+"""Register the integration package for the tests.
+
+The package module is registered without running its __init__, so the
+modules that do not depend on Home Assistant import without it. Tests of
+the others skip when Home Assistant is not installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import importlib.util
+from pathlib import Path
+import sys
+from types import ModuleType
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+INTEGRATION = ROOT / "custom_components" / "dam-ua-price"
+PACKAGE = "dam_ua_price"
+
+if PACKAGE not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE,
+        INTEGRATION / "__init__.py",
+        submodule_search_locations=[str(INTEGRATION)],
+    )
+    sys.modules[PACKAGE] = importlib.util.module_from_spec(spec)
+
+
+@pytest.fixture
+def tz() -> ZoneInfo:
+    """Return the time zone of the delivery days."""
+    return ZoneInfo("Europe/Kyiv")
+
+
+@pytest.fixture
+def integration() -> ModuleType:
+    """Return the integration package with its __init__ run."""
+    pytest.importorskip("homeassistant")
+    package = sys.modules[PACKAGE]
+    if not hasattr(package, "async_setup_entry"):
+        package.__spec__.loader.exec_module(package)
+    return package
+
+
+@pytest.fixture
+def run_with_hass(tmp_path: Path) -> Callable[[Callable[[Any], Awaitable[Any]]], Any]:
+    """Return a runner of a test coroutine on a bare Home Assistant instance."""
+    pytest.importorskip("homeassistant")
+    from homeassistant.core import HomeAssistant
+
+    def run(test: Callable[[Any], Awaitable[Any]]) -> Any:
+        async def main() -> Any:
+            hass = HomeAssistant(str(tmp_path))
+            try:
+                return await test(hass)
+            finally:
+                await hass.async_stop(force=True)
+
+        return asyncio.run(main())
+
+    return run
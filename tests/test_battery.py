@@ -0,0 +1,113 @@
+"""Tests of the battery planner."""
+
+from __future__ import annotations
+
+from itertools import product
+from math import floor, sqrt
+import random
+
+from dam_ua_price.battery import BatteryAction, BatteryConfig, BatteryPlanner
+import pytest
+
+
+def random_prices(rng: random.Random, count: int) -> tuple[list[float], list[float]]:
+    """Return buy prices and the lower sell prices of count slots."""
+    buy = [round(rng.uniform(1, 10), 2) for _ in range(count)]
+    return buy, [price * 0.8 for price in buy]
+
+
+def brute_force_profit(
+    config: BatteryConfig,
+    start_level: int,
+    top: int,
+    durations: list[float],
+    buy: list[float],
+    sell: list[float],
+) -> float:
+    """Return the best profit of every sequence of idle, charge and discharge."""
+    step = config.capacity / top
+    efficiency = sqrt(config.efficiency)
+    best = -float("inf")
+    for actions in product((0, 1, -1), repeat=len(durations)):
+        level = start_level
+        profit = 0.0
+        for action, hours, buy_price, sell_price in zip(
+            actions, durations, buy, sell
+        ):
+            charged, discharged = config.slot_energy(hours)
+            if action == 1:
+                target = min(top, level + floor(charged / step + 1e-9))
+                profit -= (target - level) * step / efficiency * buy_price
+            elif action == -1:
+                target = max(0, level - floor(discharged / step + 1e-9))
+                profit += (level - target) * step * efficiency * sell_price
+            else:
+                target = level
+            level = target
+        best = max(best, profit)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_plan_matches_brute_force(seed) -> None:
+    """The plan is the most profitable of the idle, charge and discharge moves."""
+    rng = random.Random(seed)
+    config = BatteryConfig(capacity=10, charge_power=2.5, discharge_power=4)
+    durations = [1.0] * 7
+    buy, sell = random_prices(rng, 7)
+    planner = BatteryPlanner(config, soc=rng.uniform(0, 10))
+    planner.extend(durations, buy, sell)
+    plan = planner.plan()
+    assert plan.profit == pytest.approx(
+        brute_force_profit(
+            config, planner.start_level, planner.levels, durations, buy, sell
+        )
+    )
+    assert len(plan.actions) == len(plan.soc) == 7
+    assert all(0 <= soc <= config.capacity for soc in plan.soc)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_plan_matches_full_plan(seed) -> None:
+    """Adding slots later plans the same as planning all at once."""
+    rng = random.Random(seed)
+    config = BatteryConfig(capacity=13.5, charge_power=5, discharge_power=5)
+    durations = [0.25] * 96 + [1.0] * 24
+    buy, sell = random_prices(rng, len(durations))
+
+    full = BatteryPlanner(config, soc=4)
+    full.extend(durations, buy, sell)
+    incremental = BatteryPlanner(config, soc=4)
+    for first, last in ((0, 40), (40, 96), (96, 120)):
+        incremental.extend(durations[first:last], buy[first:last], sell[first:last])
+
+    assert len(incremental) == len(full) == 120
+    assert incremental.plan() == full.plan()
+
+
+@pytest.mark.parametrize(
+    ("capacity", "power"), [(100, 2), (100, 0.3), (13.5, 5), (10, 7)]
+)
+def test_power_limits_hold(capacity, power) -> None:
+    """No slot moves more energy than its power allows, small power still runs."""
+    config = BatteryConfig(capacity=capacity, charge_power=power, discharge_power=power)
+    durations = [0.25] * 8 + [1.0] * 4
+    planner = BatteryPlanner(config, soc=0, slot_hours=0.25)
+    buy = [1.0] * 4 + [5.0] * 4 + [1.0] * 2 + [5.0] * 2
+    planner.extend(durations, buy, [price * 0.9 for price in buy])
+    plan = planner.plan()
+    assert BatteryAction.CHARGE in plan.actions
+    assert plan.profit > 0
+
+    for hours, before, after in zip(durations, (0.0, *plan.soc), plan.soc):
+        charged, discharged = config.slot_energy(hours)
+        assert after - before <= charged + 1e-9
+        assert before - after <= discharged + 1e-9
+
+
+def test_no_spread_never_charges() -> None:
+    """Flat prices never pay for the losses of charging."""
+    config = BatteryConfig(capacity=10, charge_power=5, discharge_power=5)
+    planner = BatteryPlanner(config, soc=5)
+    planner.extend([1.0] * 6, [4.0] * 6, [4.0] * 6)
+    assert set(planner.plan().actions) <= {BatteryAction.IDLE, BatteryAction.DISCHARGE}
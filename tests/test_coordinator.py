@@ -0,0 +1,79 @@
+"""Tests of the per entry coordinator."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from dam_ua_price.const import DEFAULT_SERIES  # noqa: E402
+from dam_ua_price.coordinator import DAMDataUpdateCoordinator  # noqa: E402
+from dam_ua_price.source import DAMPriceSource  # noqa: E402
+from dam_ua_price.timeline import PriceTimeline  # noqa: E402
+
+TZ = ZoneInfo("Europe/Kyiv")
+TODAY = date(2026, 10, 17)
+
+
+class StubConfigEntry:
+    """Config entry holding only what the coordinator reads."""
+
+    entry_id = "test"
+    title = "DAM test"
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.data = data
+        self.options: dict[str, Any] = {}
+
+    def async_on_unload(self, func: Any) -> None:
+        return None
+
+
+def test_only_changed_topics_are_notified(run_with_hass, monkeypatch) -> None:
+    """Listeners are called when a topic they listen to changes, all after a failure."""
+    now = datetime(2026, 10, 17, 10, 15, tzinfo=TZ)
+    monkeypatch.setattr(dt_util, "utcnow", lambda: now)
+
+    async def test(hass) -> None:
+        coordinator = DAMDataUpdateCoordinator(
+            hass,
+            StubConfigEntry({"meter_zones": "2", "price": 4.32}),
+            DAMPriceSource(hass),
+        )
+        prices = [float(hour) for hour in range(24)]
+        coordinator.primary.set_day(TODAY, PriceTimeline.for_day(TODAY, prices, TZ))
+        calls: list[str] = []
+        for topic in ("current_price", "daily_average"):
+            coordinator.async_add_listener(
+                lambda topic=topic: calls.append(topic),
+                (DEFAULT_SERIES, frozenset({topic})),
+            )
+
+        coordinator.async_update_changed()
+        assert sorted(calls) == ["current_price", "daily_average"]
+
+        # the same slot again changes nothing
+        calls.clear()
+        coordinator.async_update_changed()
+        assert calls == []
+
+        # a new slot of the same day changes the current price only
+        nonlocal now
+        now = now.replace(hour=11)
+        coordinator.async_update_changed()
+        assert calls == ["current_price"]
+
+        calls.clear()
+        coordinator.last_update_success = False
+        coordinator.async_update_changed()
+        assert sorted(calls) == ["current_price", "daily_average"]
+
+        await coordinator.async_shutdown()
+
+    run_with_hass(test)
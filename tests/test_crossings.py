@@ -0,0 +1,55 @@
+"""Tests of the threshold crossings and cheapest hours starts."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+import random
+
+from dam_ua_price.crossings import cheapest_hours_starts, runs, threshold_crossings
+from dam_ua_price.timeline import PriceTimeline
+import pytest
+
+DAY = date(2026, 6, 1)
+
+
+def test_runs_restart_after_gaps() -> None:
+    """A selected slot after a gap starts a run of its own."""
+    timeline = PriceTimeline()
+    for start in (0, 1, 2, 4, 5):
+        timeline.append(start * 3600.0, (start + 1) * 3600.0, 1.0)
+    assert runs(timeline, [True, True, False, True, True]) == [0.0, 4 * 3600.0]
+    assert runs(timeline, [True, True, True, True, False]) == [0.0, 4 * 3600.0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_threshold_crossings(seed, tz) -> None:
+    """Every slot below the threshold after one that is not starts a crossing."""
+    values = [random.Random(seed).uniform(1, 10) for _ in range(24)]
+    timeline = PriceTimeline.for_day(DAY, values, tz)
+    for below in (True, False):
+        inside = [(value < 5) if below else (value > 5) for value in values]
+        expected = [
+            timeline.starts[index]
+            for index in range(24)
+            if inside[index] and (index == 0 or not inside[index - 1])
+        ]
+        assert threshold_crossings(timeline, 5, below) == expected
+
+
+@pytest.mark.parametrize(("day", "count"), [(DAY, 96), (date(2026, 3, 29), 23)])
+def test_cheapest_hours_per_day(day, count, tz) -> None:
+    """The cheapest hours are picked within each delivery day."""
+    rng = random.Random(count)
+    timeline = PriceTimeline.for_day(
+        day, [rng.uniform(1, 10) for _ in range(count)], tz
+    )
+    starts = cheapest_hours_starts(timeline, 3, tz)
+    assert starts
+    assert all(datetime.fromtimestamp(start, tz).date() == day for start in starts)
+
+    slot = timeline.ends[0] - timeline.starts[0]
+    chosen = sorted(range(count), key=timeline.values.__getitem__)[
+        : round(3 * 3600 / slot)
+    ]
+    selected = [index in chosen for index in range(count)]
+    assert starts == runs(timeline, selected)
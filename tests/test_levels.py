@@ -0,0 +1,45 @@
+"""Tests of the cheap, normal and expensive price levels."""
+
+from __future__ import annotations
+
+from datetime import date
+import random
+
+from dam_ua_price.levels import DayLevels, LevelTimeline, PriceLevel
+from dam_ua_price.timeline import PriceTimeline
+import pytest
+
+DAY = date(2026, 6, 1)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_shares_of_the_day(seed, tz) -> None:
+    """A quarter of distinct prices is cheap and a quarter expensive."""
+    values = random.Random(seed).sample(range(1000, 9000), 96)
+    timeline = PriceTimeline.for_day(DAY, [value / 1000 for value in values], tz)
+    levels = DayLevels.build(timeline, 0.25, 0.25)
+    assert levels.levels.tolist().count(0) == 24
+    assert levels.levels.tolist().count(2) == 24
+    for value, level in zip(timeline.values, levels.levels):
+        assert (value <= levels.cheap_below) == (level == 0)
+        assert (value >= levels.expensive_above) == (level == 2)
+
+
+def test_state_and_next_change(tz) -> None:
+    """The state gives the level of a slot and where it changes next."""
+    timeline = PriceTimeline.for_day(DAY, [1.0] * 6 + [5.0] * 12 + [9.0] * 6, tz)
+    day = DayLevels.build(timeline, 0.25, 0.25)
+    levels = LevelTimeline(timeline, [day])
+
+    state = levels.state_at(timeline.starts[2] + 60)
+    assert state.level is PriceLevel.CHEAP
+    assert state.cheap_below == 1.0
+    assert state.expensive_above == 9.0
+    assert state.next_change == timeline.starts[6]
+    assert state.next_level is PriceLevel.NORMAL
+
+    state = levels.state_at(timeline.starts[20])
+    assert state.level is PriceLevel.EXPENSIVE
+    assert state.next_change is None
+
+    assert levels.state_at(timeline.ends[-1]).level is None
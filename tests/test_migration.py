@@ -0,0 +1,83 @@
+"""Tests of the migration of entries and entities made before several entries."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from dam_ua_price.const import DEFAULT_NAME, DOMAIN  # noqa: E402
+
+
+class StubConfigEntries:
+    """Config entries manager applying updates to the entry itself."""
+
+    def async_update_entry(self, entry: Any, **changes: Any) -> bool:
+        for key, value in changes.items():
+            setattr(entry, key, value)
+        return True
+
+
+def config_entry(title: str, data: dict[str, Any]) -> Any:
+    """Return an entry of version 1.1 with a title and data."""
+    return SimpleNamespace(
+        entry_id="entry",
+        version=1,
+        minor_version=1,
+        title=title,
+        data=data,
+    )
+
+
+@pytest.mark.parametrize(
+    ("unique_id", "migrated"),
+    [
+        (f"${DOMAIN}-current_price", "entry-current_price"),
+        (f"{DOMAIN}-current_price", "entry-current_price"),
+        # only the prefix is replaced
+        (f"{DOMAIN}-{DOMAIN}-x", f"entry-{DOMAIN}-x"),
+        ("entry-current_price", None),
+    ],
+)
+def test_unique_ids_move_to_the_entry(integration, unique_id, migrated) -> None:
+    """Ids shared by the domain get the entry id, ids of an entry stay."""
+    result = integration.migrate_unique_id(
+        config_entry(DEFAULT_NAME, {}), SimpleNamespace(unique_id=unique_id)
+    )
+    assert result == (migrated and {"new_unique_id": migrated})
+
+
+@pytest.mark.parametrize(
+    ("title", "data", "migrated"),
+    [
+        (DEFAULT_NAME, {"meter_zones": "3"}, f"{DEFAULT_NAME}, 3 zone meter"),
+        (
+            DEFAULT_NAME,
+            {"tariff": {"weekday": {"00:00": 1}}},
+            f"{DEFAULT_NAME}, custom tariff",
+        ),
+        (DEFAULT_NAME, {"name": "Garage"}, "Garage"),
+        # titles the user chose are kept
+        ("Home", {"meter_zones": "3"}, "Home"),
+    ],
+)
+def test_titles_tell_entries_apart(integration, title, data, migrated) -> None:
+    """Entries titled with the default name get one of their meter."""
+    entry = config_entry(title, data)
+    hass = SimpleNamespace(config_entries=StubConfigEntries())
+    assert asyncio.run(integration.async_migrate_entry(hass, entry))
+    assert entry.title == migrated
+    assert entry.minor_version == 2
+
+
+def test_newer_versions_are_not_migrated(integration) -> None:
+    """An entry of a later major version fails to migrate."""
+    entry = config_entry(DEFAULT_NAME, {})
+    entry.version = 2
+    hass = SimpleNamespace(config_entries=StubConfigEntries())
+    assert not asyncio.run(integration.async_migrate_entry(hass, entry))
+    assert entry.title == DEFAULT_NAME
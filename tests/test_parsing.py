@@ -0,0 +1,76 @@
+"""Tests of the OREE response validation."""
+
+from __future__ import annotations
+
+from datetime import date
+import math
+
+from dam_ua_price.parsing import PRICE_MAX, InvalidPrices, parse_prices
+import pytest
+
+DAY = date(2026, 6, 1)
+SPRING = date(2026, 3, 29)
+AUTUMN = date(2026, 10, 25)
+VALID_COUNTS = {DAY: {24, 48, 96}, SPRING: {23, 46, 92}, AUTUMN: {25, 50, 100}}
+
+
+@pytest.mark.parametrize("day", VALID_COUNTS)
+def test_only_slot_grids_are_accepted(day, tz) -> None:
+    """Only hourly, half-hourly and quarter-hourly grids of the day parse."""
+    for count in range(1, 121):
+        data = {"pricesData": [4000.0] * count}
+        if count in VALID_COUNTS[day]:
+            assert len(parse_prices(data, day, tz)) == count
+        else:
+            with pytest.raises(InvalidPrices, match=str(count)):
+                parse_prices(data, day, tz)
+
+
+def test_truncated_quarter_hours_are_rejected(tz) -> None:
+    """A quarter-hourly day cut to 24 prices is not taken for an hourly one."""
+    with pytest.raises(InvalidPrices):
+        parse_prices({"pricesData": [4000.0] * 24}, SPRING, tz)
+
+
+@pytest.mark.parametrize(
+    ("value", "message"),
+    [
+        ("4000", "not a number"),
+        (None, "not a number"),
+        (-1.0, "outside"),
+        (PRICE_MAX + 1, "outside"),
+        (math.nan, "outside"),
+        (True, "not a number"),
+        (False, "not a number"),
+        (10**400, "outside"),
+        (-(10**400), "outside"),
+    ],
+)
+def test_bad_values_are_rejected(value, message, tz) -> None:
+    """The first bad price is named in the error."""
+    prices = [4000.0] * 24
+    prices[5] = value
+    with pytest.raises(InvalidPrices, match=f"price 5 .*{message}"):
+        parse_prices({"pricesData": prices}, DAY, tz)
+
+
+@pytest.mark.parametrize(
+    "data", [[], "prices", {"pricesData": "4000"}, {"pricesData": {"0": 1}}]
+)
+def test_bad_shapes_are_rejected(data, tz) -> None:
+    """Anything but an object with a list of prices is rejected."""
+    with pytest.raises(InvalidPrices):
+        parse_prices(data, DAY, tz)
+
+
+@pytest.mark.parametrize("data", [{}, {"pricesData": []}, {"pricesData": None}])
+def test_unpublished_day(data, tz) -> None:
+    """A day without prices is not published yet."""
+    assert parse_prices(data, DAY, tz) is None
+
+
+def test_prices_are_per_kwh(tz) -> None:
+    """Prices arrive per MWh and are kept per kWh."""
+    timeline = parse_prices({"pricesData": list(range(0, 2400, 100))}, DAY, tz)
+    assert list(timeline.values) == [hour / 10 for hour in range(24)]
+    assert timeline.ends[-1] - timeline.starts[0] == 86400
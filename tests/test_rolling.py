@@ -0,0 +1,101 @@
+"""Tests of the rolling averages and percentiles against sorted lists."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import date, timedelta
+from math import ceil
+import random
+
+from dam_ua_price.rolling import QUANTILES, WINDOWS, QuantileTree, RollingPrices
+import pytest
+
+FIRST_DAY = date(2026, 1, 1)
+
+
+def quantile(values: list[float], q: float) -> float | None:
+    """Return the price below which a share q of the prices lie."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(ceil(q * len(ordered)), 1) - 1]
+
+
+def random_day(rng: random.Random) -> array:
+    """Return the hourly prices of a day on the 0.01 bucket grid."""
+    return array("d", (round(rng.uniform(1, 12), 2) for _ in range(24)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_windows_match_a_full_scan(seed) -> None:
+    """Averages and percentiles equal the ones of the days in each window."""
+    rng = random.Random(seed)
+    rolling = RollingPrices()
+    days: dict[date, array] = {}
+
+    for offset in range(60):
+        today = FIRST_DAY + timedelta(days=offset)
+        rolling.advance(today)
+        # tomorrow arrives ahead of time, sometimes a day is missing
+        tomorrow = today + timedelta(days=1)
+        if rng.random() < 0.9:
+            days[tomorrow] = random_day(rng)
+            rolling.add_day(tomorrow, days[tomorrow])
+        if offset % 11 == 3:
+            # a day is fetched again with corrected prices
+            days[today] = random_day(rng)
+            rolling.add_day(today, days[today])
+
+        for window in WINDOWS:
+            values = [
+                value
+                for day, prices in days.items()
+                if 0 <= (today - day).days < window
+                for value in prices
+            ]
+            if values:
+                assert rolling.average(window) == pytest.approx(
+                    sum(values) / len(values)
+                )
+            else:
+                assert rolling.average(window) is None
+            assert rolling.days(window) == sum(
+                0 <= (today - day).days < window for day in days
+            )
+            if window == rolling.longest:
+                for q in QUANTILES:
+                    expected = quantile(values, q)
+                    assert rolling.quantile(q) == pytest.approx(expected)
+
+
+def test_day_change() -> None:
+    """The change compares the averages of today and yesterday."""
+    rolling = RollingPrices()
+    rolling.advance(FIRST_DAY)
+    rolling.add_day(FIRST_DAY, array("d", [4.0, 6.0]))
+    assert rolling.day_change() is None
+    rolling.add_day(FIRST_DAY - timedelta(days=1), array("d", [3.0, 3.0]))
+    assert rolling.day_change() == pytest.approx(2.0)
+
+
+def test_old_days_are_ignored() -> None:
+    """Days before the longest window are not kept."""
+    rolling = RollingPrices()
+    rolling.advance(FIRST_DAY)
+    rolling.add_day(FIRST_DAY - timedelta(days=max(WINDOWS)), array("d", [5.0]))
+    assert rolling.quantile(0.5) is None
+    assert rolling.days(max(WINDOWS)) == 0
+
+
+def test_quantile_tree_kth() -> None:
+    """The k-th smallest price comes back on the bucket grid."""
+    tree = QuantileTree()
+    values = array("d", [0.0, 7.25, 1.5, 100.0, 1.5])
+    tree.add(values)
+    assert [tree.kth(k) for k in range(1, 6)] == pytest.approx(
+        sorted(values.tolist())
+    )
+    tree.add(array("d", [1.5]), -1)
+    assert tree.count == 4
+    assert tree.kth(2) == pytest.approx(1.5)
+    assert tree.kth(3) == pytest.approx(7.25)
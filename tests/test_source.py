@@ -0,0 +1,132 @@
+"""Tests of the price source shared by the config entries."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from dam_ua_price.source import (  # noqa: E402
+    DATA_SOURCE,
+    FETCH_RETRY_INTERVAL,
+    PUBLICATION_POLL_INITIAL,
+    PUBLICATION_POLL_MAX,
+    DAMPriceSource,
+)
+from dam_ua_price.timeline import PriceTimeline  # noqa: E402
+
+TZ = ZoneInfo("Europe/Kyiv")
+TODAY = date(2026, 10, 17)
+TOMORROW = TODAY + timedelta(days=1)
+
+
+def add_day(source: DAMPriceSource, day: date) -> None:
+    """Give every series of the source flat prices for a day."""
+    for series in source.series.values():
+        series.set_day(day, PriceTimeline.for_day(day, [1.0] * 24, TZ))
+
+
+def test_series_follow_the_attached_entries(run_with_hass) -> None:
+    """Series and retention are those the remaining entries ask for."""
+
+    async def test(hass) -> None:
+        source = DAMPriceSource(hass)
+        first, second = object(), object()
+        series = source.attach(first, ["IDM_2"], 7)
+        assert set(series) == {"DAM_2", "IDM_2"}
+        source.attach(second, ["DAM_1"], 1)
+        assert set(source.series) == {"DAM_2", "IDM_2", "DAM_1"}
+        assert source.retention_days == 7
+
+        await source.async_detach(first)
+        assert set(source.series) == {"DAM_2", "DAM_1"}
+        assert source.retention_days == 1
+        assert all(series.retention_days == 1 for series in source.series.values())
+
+        # detaching twice does nothing
+        await source.async_detach(first)
+        assert source.coordinators.keys() == {second}
+
+    run_with_hass(test)
+
+
+def test_last_detach_stops_fetching(run_with_hass) -> None:
+    """A stopped source neither fetches nor schedules another fetch."""
+
+    async def test(hass) -> None:
+        source = DAMPriceSource.async_get(hass)
+        assert DAMPriceSource.async_get(hass) is source
+        coordinator = object()
+        source.attach(coordinator, [], 1)
+
+        await source.async_detach(coordinator)
+        assert DATA_SOURCE not in hass.data
+        assert DAMPriceSource.async_get(hass) is not source
+
+        await source.fetch_data(dt_util.utcnow())
+        assert source.unsubSyncPrices is None
+        assert source.next_fetch is None
+
+    run_with_hass(test)
+
+
+def assert_poll_delay(delay: timedelta, polls: int) -> None:
+    """Assert a delay is the backoff of a poll count with its jitter."""
+    expected = min(PUBLICATION_POLL_MAX, PUBLICATION_POLL_INITIAL * 2**polls)
+    assert expected * 0.5 <= delay <= expected * 1.5
+
+
+def test_next_fetch_backoff(run_with_hass) -> None:
+    """Missing tomorrow is polled for with a growing, capped delay."""
+
+    async def test(hass) -> None:
+        source = DAMPriceSource(hass)
+        source.attach(object(), ["IDM_2"], 1)
+
+        morning = datetime(2026, 10, 17, 8, tzinfo=TZ)
+        assert source.get_next_fetch(morning) == morning + FETCH_RETRY_INTERVAL
+        add_day(source, TODAY)
+        assert source.get_next_fetch(morning) == source.get_publication_start(TODAY)
+
+        afternoon = morning.replace(hour=15)
+        for polls in range(8):
+            assert_poll_delay(source.get_next_fetch(afternoon) - afternoon, polls)
+
+        # tomorrow of one series only is not enough
+        source.series["DAM_2"].set_day(
+            TOMORROW, PriceTimeline.for_day(TOMORROW, [1.0] * 24, TZ)
+        )
+        assert_poll_delay(source.get_next_fetch(afternoon) - afternoon, 8)
+
+        add_day(source, TOMORROW)
+        assert source.get_next_fetch(afternoon) == source.get_publication_start(
+            TOMORROW
+        )
+        assert source.publication_polls == 0
+
+    run_with_hass(test)
+
+
+def test_polls_start_over_every_day(run_with_hass) -> None:
+    """A day never published does not slow down polling for the next one."""
+
+    async def test(hass) -> None:
+        source = DAMPriceSource(hass)
+        source.attach(object(), [], 1)
+        add_day(source, TODAY)
+        afternoon = datetime(2026, 10, 17, 15, tzinfo=TZ)
+        for _ in range(10):
+            source.get_next_fetch(afternoon)
+
+        # tomorrow only came the next day, the day after is polled afresh
+        add_day(source, TOMORROW)
+        afternoon = afternoon + timedelta(days=1)
+        assert_poll_delay(source.get_next_fetch(afternoon) - afternoon, 0)
+        assert source.publication_day == TOMORROW + timedelta(days=1)
+
+    run_with_hass(test)
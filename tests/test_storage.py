@@ -0,0 +1,66 @@
+"""Tests of the sharded price store."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, date, datetime
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from dam_ua_price.storage import DAMPriceStore  # noqa: E402
+
+FETCHED_AT = datetime(2026, 10, 17, 12, tzinfo=UTC)
+
+
+def test_days_survive_a_new_store(run_with_hass) -> None:
+    """Flushed days are read back by another store on the same key."""
+
+    async def test(hass) -> None:
+        store = DAMPriceStore(hass, "test.prices")
+        await store.async_put_day(date(2026, 9, 30), FETCHED_AT, [1.0, 2.0])
+        await store.async_put_day(date(2026, 10, 1), FETCHED_AT, [3.0])
+        await store.async_flush()
+
+        days = await DAMPriceStore(hass, "test.prices").async_load_days(
+            [date(2026, 9, 30), date(2026, 10, 1), date(2026, 10, 2)]
+        )
+        assert days == {
+            date(2026, 9, 30): (FETCHED_AT, [1.0, 2.0]),
+            date(2026, 10, 1): (FETCHED_AT, [3.0]),
+        }
+
+    run_with_hass(test)
+
+
+def test_concurrent_puts_to_an_unloaded_shard(run_with_hass) -> None:
+    """Days put while their shard is being read are all kept."""
+
+    async def test(hass) -> None:
+        store = DAMPriceStore(hass, "test.prices")
+        days = [date(2026, 10, 17), date(2026, 10, 18)]
+        await asyncio.gather(
+            *(store.async_put_day(day, FETCHED_AT, [1.0]) for day in days)
+        )
+        await store.async_flush()
+
+        loaded = await DAMPriceStore(hass, "test.prices").async_load_days(days)
+        assert set(loaded) == set(days)
+
+    run_with_hass(test)
+
+
+def test_release_keeps_pending_days(run_with_hass) -> None:
+    """Releasing memory does not lose days not written yet."""
+
+    async def test(hass) -> None:
+        store = DAMPriceStore(hass, "test.prices")
+        await store.async_put_day(date(2026, 10, 17), FETCHED_AT, [1.0])
+        assert not await store.async_has_day(date(2026, 8, 1))
+        store.release()
+        assert store.loaded_days == 1
+        assert await store.async_has_day(date(2026, 10, 17))
+        assert (store.stats.hits, store.stats.misses) == (1, 1)
+
+    run_with_hass(test)
@@ -0,0 +1,126 @@
+"""Tests of the tariff schedules and their rate tables."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from dam_ua_price.tariff import TariffSchedule
+from dam_ua_price.timeline import PriceTimeline
+import pytest
+
+SPRING = date(2026, 3, 29)
+AUTUMN = date(2026, 10, 25)
+DAY = date(2026, 6, 1)
+
+
+def day_timeline(day: date, count: int, tz) -> PriceTimeline:
+    """Return a timeline of a day with count flat priced slots."""
+    return PriceTimeline.for_day(day, [1.0] * count, tz)
+
+
+@pytest.mark.parametrize(
+    ("day", "count", "rates"),
+    [
+        # hours 0 to 6 and 23 are night, 03:00 is skipped in spring
+        (DAY, 24, {0.5: 8, 1.0: 16}),
+        (SPRING, 23, {0.5: 7, 1.0: 16}),
+        # and repeated in autumn
+        (AUTUMN, 25, {0.5: 9, 1.0: 16}),
+        (SPRING, 92, {0.5: 28, 1.0: 64}),
+        (AUTUMN, 100, {0.5: 36, 1.0: 64}),
+    ],
+)
+def test_two_zone_preset_on_dst_days(day, count, rates, tz) -> None:
+    """Night and day hours follow the wall clock on days of 23 and 25 hours."""
+    timeline = day_timeline(day, count, tz)
+    table = TariffSchedule.preset("2").rates(timeline, tz)
+    assert Counter(table) == rates
+
+
+@pytest.mark.parametrize("zones", ["1", "2", "3"])
+@pytest.mark.parametrize(
+    ("first", "counts"),
+    [(date(2026, 3, 28), (96, 92, 96)), (date(2026, 10, 24), (24, 25, 24))],
+)
+def test_rate_table_matches_rate_at(zones, first, counts, tz) -> None:
+    """The table of days around a DST change agrees with the rate of each slot."""
+    schedule = TariffSchedule.preset(zones)
+    timeline = PriceTimeline.concat(
+        day_timeline(first + timedelta(days=offset), count, tz)
+        for offset, count in enumerate(counts)
+    )
+    table = schedule.rates(timeline, tz)
+    assert len(table) == sum(counts)
+    for start, rate in zip(timeline.starts, table):
+        assert rate == schedule.rate_at(datetime.fromtimestamp(start, tz), tz)
+
+
+def test_next_change_crosses_midnight(tz) -> None:
+    """After the last change of a day the next one is the midnight."""
+    schedule = TariffSchedule.preset("2")
+    assert schedule.next_change(datetime(2026, 6, 1, 6, 30, tzinfo=tz), tz) == (
+        datetime(2026, 6, 1, 7, 0, tzinfo=tz)
+    )
+    assert schedule.next_change(datetime(2026, 6, 1, 23, 30, tzinfo=tz), tz) == (
+        datetime(2026, 6, 2, 0, 0, tzinfo=tz)
+    )
+
+
+def test_periods_weekends_and_holidays(tz) -> None:
+    """Periods start on their date, holidays use their own profile."""
+    schedule = TariffSchedule.from_config(
+        {
+            "periods": [
+                {"weekday": {"00:00": 0.5, "07:00": 1.0}},
+                {
+                    "effective_from": "2026-11-01",
+                    "weekday": {"00:00": 0.4, "07:00": 1.2},
+                    "weekend": {"00:00": 0.3},
+                },
+            ],
+            "holidays": ["2026-12-25"],
+        }
+    )
+    noon = datetime(2026, 10, 30, 12, tzinfo=tz)
+    assert schedule.rate_at(noon, tz) == 1.0
+    assert schedule.rate_at(noon.replace(day=31), tz) == 1.0
+    assert schedule.rate_at(noon.replace(month=11, day=2), tz) == 1.2
+    assert schedule.rate_at(noon.replace(month=11, day=7), tz) == 0.3
+    # holidays default to the weekend rates
+    assert schedule.rate_at(noon.replace(month=12, day=25), tz) == 0.3
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        [],
+        {"weekday": {}},
+        {"weekday": {"7am": 1.0}},
+        {"weekday": {"07:00": "1"}},
+        {"weekday": {"07:00": 11}},
+        {"weekday": {"07:00": 1.0}, "weekends": {"00:00": 1.0}},
+        {"periods": []},
+        {"weekday": {"07:00": 1.0}, "holidays": ["25.12.2026"]},
+    ],
+)
+def test_invalid_tariffs(config) -> None:
+    """Mistakes in a tariff raise ValueError."""
+    with pytest.raises(ValueError):
+        TariffSchedule.from_config(config)
+
+
+def test_change_within_a_slot(tz) -> None:
+    """A rate changing within a slot is averaged over the slot."""
+    schedule = TariffSchedule.from_config({"weekday": {"00:00": 0.5, "07:30": 1.0}})
+    table = schedule.rates(day_timeline(DAY, 24, tz), tz)
+    assert table[6] == 0.5
+    assert table[7] == pytest.approx(0.75)
+    assert table[8] == 1.0
+    # the night rate comes back at midnight, at the start of a slot
+    assert table[23] == 1.0
+    assert schedule.rate_at(datetime(2026, 6, 1, 7, 29, tzinfo=tz), tz) == 0.5
+    assert schedule.rate_at(datetime(2026, 6, 1, 7, 30, tzinfo=tz), tz) == 1.0
+    assert schedule.next_change(datetime(2026, 6, 1, 7, tzinfo=tz), tz) == (
+        datetime(2026, 6, 1, 7, 30, tzinfo=tz)
+    )
@@ -0,0 +1,53 @@
+"""Tests of the price timeline lookups."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from dam_ua_price.timeline import PriceTimeline
+import pytest
+
+DAY = date(2026, 10, 25)
+
+
+@pytest.fixture
+def timeline(tz) -> PriceTimeline:
+    """Return the 25 hourly slots of the autumn DST day and the day after."""
+    return PriceTimeline.concat(
+        (
+            PriceTimeline.for_day(DAY, [float(hour) for hour in range(25)], tz),
+            PriceTimeline.for_day(
+                DAY + timedelta(days=1), [float(hour) for hour in range(24)], tz
+            ),
+        )
+    )
+
+
+def test_slots_follow_each_other(timeline) -> None:
+    """Every slot lasts an hour and starts when the one before ends."""
+    assert len(timeline) == 49
+    assert set(end - start for start, end in zip(timeline.starts, timeline.ends)) == {
+        3600.0
+    }
+    assert list(timeline.starts[1:]) == list(timeline.ends[:-1])
+
+
+def test_lookups(timeline, tz) -> None:
+    """Lookups find the slot of a time and the next slot boundary."""
+    # the repeated 03:00 is the fifth slot
+    second_three = datetime(2026, 10, 25, 3, 30, tzinfo=tz, fold=1).timestamp()
+    assert timeline.index_at(second_three) == 4
+    assert timeline.price_at(second_three) == 4.0
+    assert timeline.next_boundary(second_three) == timeline.starts[5]
+    assert timeline.index_at(timeline.starts[0] - 1) is None
+    assert timeline.next_boundary(timeline.starts[0] - 1) == timeline.starts[0]
+    assert timeline.price_at(timeline.ends[-1]) is None
+    assert timeline.next_boundary(timeline.ends[-1]) is None
+
+
+def test_range_slice(timeline) -> None:
+    """A slice keeps the slots overlapping the interval."""
+    start = timeline.starts[10] + 1800
+    part = timeline.range_slice(start, timeline.starts[30])
+    assert list(part.values) == list(timeline.values[10:30])
+    assert not timeline.range_slice(timeline.ends[-1], timeline.ends[-1] + 3600)
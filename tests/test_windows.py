@@ -0,0 +1,88 @@
+"""Tests of the cheapest window and slots against brute force."""
+
+from __future__ import annotations
+
+from itertools import combinations
+import random
+
+from dam_ua_price.timeline import PriceTimeline
+from dam_ua_price.windows import cheapest_slots, cheapest_window
+import pytest
+
+HOUR = 3600.0
+
+
+def random_timeline(rng: random.Random, count: int, gaps: bool) -> PriceTimeline:
+    """Return hourly slots with random prices, some hours missing with gaps."""
+    timeline = PriceTimeline()
+    start = 0.0
+    for _ in range(count):
+        if gaps and rng.random() < 0.15:
+            start += HOUR
+        timeline.append(start, start + HOUR, round(rng.uniform(1, 10), 2))
+        start += HOUR
+    return timeline
+
+
+def brute_force_window(
+    timeline: PriceTimeline, duration: float, earliest: float, deadline: float | None
+) -> float | None:
+    """Return the lowest average of the shortest gapless runs lasting duration."""
+    best = None
+    for head in range(len(timeline)):
+        if timeline.starts[head] < earliest:
+            continue
+        covered = cost = 0.0
+        for index in range(head, len(timeline)):
+            if index > head and timeline.starts[index] != timeline.ends[index - 1]:
+                break
+            if deadline is not None and timeline.ends[index] > deadline:
+                break
+            length = timeline.ends[index] - timeline.starts[index]
+            covered += length
+            cost += timeline.values[index] * length
+            if covered >= duration:
+                if best is None or cost / covered < best:
+                    best = cost / covered
+                break
+    return best
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cheapest_window_matches_brute_force(seed) -> None:
+    """The sliding window finds the same average as trying every start."""
+    rng = random.Random(seed)
+    timeline = random_timeline(rng, 48, gaps=bool(seed % 2))
+    end = timeline.ends[-1]
+    for duration in (HOUR, 2.5 * HOUR, 4 * HOUR, 12 * HOUR):
+        for earliest, deadline in ((0.0, None), (5 * HOUR, end - 7 * HOUR)):
+            window = cheapest_window(timeline, duration, earliest, deadline)
+            expected = brute_force_window(timeline, duration, earliest, deadline)
+            if expected is None:
+                assert window is None
+                continue
+            assert window.average == pytest.approx(expected)
+            assert window.start(timeline) >= earliest
+            assert deadline is None or window.end(timeline) <= deadline
+
+
+def test_cheapest_window_too_long() -> None:
+    """No window is found when the slots do not last long enough."""
+    timeline = random_timeline(random.Random(0), 4, gaps=False)
+    assert cheapest_window(timeline, 5 * HOUR, 0.0) is None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_cheapest_slots_match_brute_force(seed) -> None:
+    """The cheapest slots have the lowest sum of all choices."""
+    rng = random.Random(seed)
+    timeline = random_timeline(rng, 12, gaps=False)
+    for hours in (1, 3, 5):
+        slots = cheapest_slots(timeline, hours * HOUR, 0.0)
+        expected = min(
+            sum(timeline.values[index] for index in chosen)
+            for chosen in combinations(range(12), hours)
+        )
+        assert len(slots.indexes) == hours
+        assert slots.average * hours == pytest.approx(expected)
+        assert list(slots.indexes) == sorted(slots.indexes)